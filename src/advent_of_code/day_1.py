@@ -1,31 +1,122 @@
-from src.input_util import get_input
+import heapq
+import warnings
+from typing import Iterator
 
+import numpy as np
 
-def part1(input_data: str):
-    best = current = 0
-    for line in input_data.split('\n'):
-        if line:
-            current += int(line)
-        else:
-            best = max(current, best)
-            current = 0
+from src.input_util import InputData, Lines, iter_lines, map_input
 
-    return best
+# python: streams over the lines, in constant memory
+# numpy: vectorized over the whole input at once, faster for large inputs that fit in memory several times over
+ENGINES = ('python', 'numpy')
 
 
-def part2(input_data: str):
-    totals = []
-    current = 0
-    for line in input_data.split('\n'):
-        if line:
-            current += int(line)
-        else:
-            totals.append(current)
-            current = 0
+def totals(input_data: InputData | Lines) -> Iterator[int]:
+    """The total calories carried by every elf. Streams over the lines, so the input is never held in memory as a whole."""
+    lines = iter_lines(input_data) if isinstance(input_data, InputData) else input_data
+    total = None
+    for line in lines:
+        if line.strip():
+            total = (total or 0) + int(line)
+        elif total is not None:
+            yield total
+            total = None
+    if total is not None:
+        yield total
 
-    return sum(sorted(totals)[-3:])
+
+def parse_numbers(data: bytes) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    The numbers of the non-blank lines, and which lines are blank, parsed in C without splitting the lines.
+    None unless every line is blank or at most 18 digits, then the numbers fit in 64 bits.
+    """
+    if any(blank in data for blank in (b' ', b'\t', b'\r')):
+        return None
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+    lengths = np.diff(newlines, prepend=-1, append=len(data)) - 1
+    if len(lengths) and lengths.max() > 18:
+        return None
+    try:
+        with warnings.catch_warnings():
+            # Raised when there is something else than digits
+            warnings.simplefilter('error', DeprecationWarning)
+            values = np.fromstring(data, dtype=np.int64, sep=' ')
+    except (ValueError, DeprecationWarning):
+        return None
+    is_blank = lengths == 0
+    # Catches lines like '1-2', which are read as two numbers
+    if len(values) != np.count_nonzero(~is_blank):
+        return None
+    return values, is_blank
+
+
+def parse_lines(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """The numbers of the non-blank lines, and which lines are blank, with the same rules as `int`."""
+    lines = np.array(data.split(b'\n'))
+    is_blank = np.char.strip(lines) == b''
+    try:
+        return lines[~is_blank].astype(np.int64), is_blank
+    except OverflowError:
+        raise ValueError('Calories too large for the numpy engine')
+
+
+def totals_numpy(input_data: InputData) -> np.ndarray:
+    """
+    The total calories carried by every elf, with the lines parsed as a whole in C and summed per group of lines between
+    blank lines. Inputs with other whitespace than newlines or with unusual numbers are parsed a line at a time instead.
+    Raises ValueError when a total doesn't fit in 64 bits.
+    """
+    data = input_data.encode('ascii') if isinstance(input_data, str) else bytes(input_data)
+    values, is_blank = parse_numbers(data) or parse_lines(data)
+    if not len(values):
+        return values
+    # Then no sum of a group can overflow either
+    if np.abs(values).max() >= np.iinfo(np.int64).max // len(values):
+        raise ValueError('Calories too large for the numpy engine')
+    # A blank line ends a group, several blank lines in a row don't start empty groups
+    groups = np.cumsum(is_blank)[~is_blank]
+    group_starts = np.flatnonzero(np.concatenate(([True], groups[1:] != groups[:-1])))
+    return np.add.reduceat(values, group_starts)
+
+
+def top_totals(input_data: InputData | Lines, k: int, engine: str = 'python') -> list[int]:
+    """
+    The k highest totals, highest first.
+    The python engine only keeps k totals at a time, in a heap. The numpy engine needs the input as a string or buffer.
+    """
+    match engine:
+        case 'python':
+            return heapq.nlargest(k, totals(input_data))
+        case 'numpy':
+            if k <= 0:
+                # elf_totals[-0:] would be all totals
+                return []
+            elf_totals = totals_numpy(input_data)
+            if len(elf_totals) > k:
+                elf_totals = np.partition(elf_totals, -k)[-k:]
+            return sorted(elf_totals.tolist(), reverse=True)
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
+
+
+def solve(input_data: InputData | Lines, k: int = 3, engine: str = 'python') -> tuple[int, int]:
+    """Both parts in a single pass over the input: the highest total, and the sum of the k highest. Both are 0 without elves."""
+    top = top_totals(input_data, max(k, 1), engine)
+    return (top[0] if top else 0), sum(top[:max(k, 0)])
+
+
+def part1(input_data: InputData | Lines, engine: str = 'python'):
+    top = top_totals(input_data, 1, engine)
+    return top[0] if top else 0
+
+
+def part2(input_data: InputData | Lines, k: int = 3, engine: str = 'python'):
+    return sum(top_totals(input_data, k, engine))
 
 
 if __name__ == '__main__':
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    with map_input() as input_data:
+        solution_1, solution_2 = solve(input_data)
+        assert solve(input_data, engine='numpy') == (solution_1, solution_2)
+        print(f'Solution for part 1 is: {solution_1}')
+        print(f'Solution for part 2 is: {solution_2}')
@@ -1,7 +1,8 @@
+import json
 import random
 from typing import Callable, TypeVar
 
-from src.input_util import get_input
+from src.input_util import get_input, parse_cache
 
 EXAMPLE_PART_1 = """[1,1,3,1,1]
 [1,1,5,1,1]
@@ -50,16 +51,26 @@ Value = int | list[int]
 Packet = list[Value]
 
 
+def parse_packet(line: str) -> Packet:
+    """Packets are JSON lists of ints and lists"""
+    packet = json.loads(line)
+    if not isinstance(packet, list):
+        raise ValueError(f'Expected a list, got {line!r}')
+    return packet
+
+
+@parse_cache
 def parse_pairs(input_data: str) -> list[tuple[Packet, Packet]]:
     packets = []
     for lines in input_data.split('\n\n'):
         line_one, line_two = lines.split('\n')
-        packets.append((eval(line_one), eval(line_two)))
+        packets.append((parse_packet(line_one), parse_packet(line_two)))
     return packets
 
 
+@parse_cache
 def parse_all(input_data: str) -> list[Packet]:
-    return [eval(line) for line in input_data.split('\n') if line]
+    return [parse_packet(line) for line in input_data.split('\n') if line]
 
 
 def compare(one: Packet | Value, other: Packet | Value) -> bool | None:
@@ -1,8 +1,9 @@
-import dataclasses
 import itertools
-from collections import defaultdict
-from enum import Enum
+from enum import IntEnum
 
+import numpy as np
+
+from src.grid_util import Grid
 from src.input_util import get_input
 
 EXAMPLE = """498,4 -> 498,6 -> 496,6
@@ -11,77 +12,80 @@ EXAMPLE = """498,4 -> 498,6 -> 496,6
 SOURCE = 500, 0
 
 
-class Tile(Enum):
-    AIR = '.'
-    ROCK = '#'
-    SOURCE = '+'
-    SAND = 'o'
+class Tile(IntEnum):
+    AIR = 0
+    ROCK = 1
+    SOURCE = 2
+    SAND = 3
 
 
-@dataclasses.dataclass
-class Cave:
-    tiles: dict[int, list[Tile]]
-    sand: int = 0
+TILE_CHARS = '.#+o'
+
 
-    def __init__(self, max_y: int, floor: bool):
+class Cave:
+    """
+    tiles: indexed by x - min_x, y
+    sand: the number of units of sand that came to rest
+    """
+
+    def __init__(self, min_x: int, max_x: int, max_y: int, floor: bool):
+        self.min_x = min_x
+        self.height = max_y + 3 if floor else max_y + 1
+        self.tiles = Grid(np.zeros((max_x - min_x + 1, self.height), dtype=np.uint8))
         if floor:
-            self.tiles = defaultdict(lambda: [Tile.AIR] * (max_y + 2) + [Tile.ROCK])
-        else:
-            self.tiles = defaultdict(lambda: [Tile.AIR] * (max_y + 1))
-        self.height = len(self.tiles[SOURCE[0]])
-
-    def swap(self, co1: tuple[int, int], co2: tuple[int, int]):
-        self.tiles[co1[0]][co1[1]], self.tiles[co2[0]][co2[1]] = self.tiles[co2[0]][co2[1]], self.tiles[co1[0]][co1[1]]
-
-    def update_sand(self, co: tuple[int, int]) -> tuple[int, int] | None:
-        below = co[0], co[1] + 1
-        below_left = co[0] - 1, co[1] + 1
-        below_right = co[0] + 1, co[1] + 1
-        if self.tiles[below[0]][below[1]] == Tile.AIR:
-            self.swap(co, below)
-            return below
-        elif self.tiles[below_left[0]][below_left[1]] == Tile.AIR:
-            self.swap(co, below_left)
-            return below_left
-        elif self.tiles[below_right[0]][below_right[1]] == Tile.AIR:
-            self.swap(co, below_right)
-            return below_right
-        else:
-            return None
+            self.tiles[:, -1] = Tile.ROCK
+        self.floor = floor
+        self.sand = 0
+
+    def __setitem__(self, co: tuple[int, int], tile: Tile):
+        self.tiles[co[0] - self.min_x, co[1]] = tile
 
     def simulate(self):
-        while True:
-            # print(self.image))
-            prev, head = None, SOURCE
-            self.tiles[head[0]][head[1]] = Tile.SAND
-            while head is not None:
-                if head[1] == self.height - 1:
-                    # Sand is falling off
-                    self.tiles[SOURCE[0]][SOURCE[1]] = Tile.SOURCE  # reset source for the image
-                    return
-                prev, head = head, self.update_sand(head)
-
-            self.sand += 1
-            if prev == SOURCE and head is None:
-                # Couldn't move from the source, meaning we're full
-                # print(self.image)
+        """
+        Every unit of sand follows the path of the previous one, up to where that one came to rest.
+        So the path is kept as a stack, and the next unit starts from the position before the last one.
+        """
+        # Flat indices. The cell below is the next one, the columns to the left and right are `height` away
+        tiles = self.tiles.flat()
+        path = [(SOURCE[0] - self.min_x) * self.height + SOURCE[1]]
+        while path:
+            position = path[-1]
+            if position % self.height == self.height - 1:
+                # Sand is falling off
                 return
+            for below in (position + 1, position + 1 - self.height, position + 1 + self.height):
+                if tiles[below] == Tile.AIR:
+                    path.append(below)
+                    break
+            else:
+                # Comes to rest. Once that happens at the source, we're full
+                tiles[position] = Tile.SAND
+                self.sand += 1
+                path.pop()
 
     @property
     def image(self) -> str:
-        min_x, max_x = min(self.tiles), max(self.tiles)
-        return '\n'.join(''.join(self.tiles[x][y].value for x in range(min_x, 1 + max_x)) for y in range(0, len(self.tiles[min_x])))
+        # The columns with rocks, and around the sand. Leaves out the floor, which is infinitely wide
+        tiles = self.tiles.cells[:, :-1] if self.floor else self.tiles.cells
+        columns = np.flatnonzero((tiles == Tile.ROCK).any(axis=1) | (tiles == Tile.SOURCE).any(axis=1))
+        sand_columns = np.flatnonzero((tiles == Tile.SAND).any(axis=1))
+        if len(sand_columns):
+            columns = np.concatenate([columns, sand_columns - 1, sand_columns + 1])
+        return Grid(self.tiles.cells[columns.min():columns.max() + 1].T).to_text(TILE_CHARS)
 
 
 def parse_cave(input_data: str, floor: bool) -> Cave:
     rocks = [
-        [eval(coordinate_str) for coordinate_str in line.split(' -> ')]
+        [tuple(map(int, coordinate_str.split(','))) for coordinate_str in line.split(' -> ')]
         for line in input_data.split('\n')
     ]
     max_y = max(coordinate[1] for rock in rocks for coordinate in rock)
+    # Sand moves at most one column sideways per row it falls
+    min_x = min([SOURCE[0] - max_y - 3] + [coordinate[0] - 1 for rock in rocks for coordinate in rock])
+    max_x = max([SOURCE[0] + max_y + 3] + [coordinate[0] + 1 for rock in rocks for coordinate in rock])
 
-    cave = Cave(max_y, floor)
-    cave.tiles[SOURCE[0]][SOURCE[1]] = Tile.SOURCE
+    cave = Cave(min_x, max_x, max_y, floor)
+    cave[SOURCE] = Tile.SOURCE
 
     for rock in rocks:
         for i in range(1, len(rock)):
@@ -89,7 +93,7 @@ def parse_cave(input_data: str, floor: bool) -> Cave:
             x_range = range(min(prev[0], current[0]), max(prev[0], current[0]) + 1)
             y_range = range(min(prev[1], current[1]), max(prev[1], current[1]) + 1)
             for x, y in itertools.product(x_range, y_range):
-                cave.tiles[x][y] = Tile.ROCK
+                cave[x, y] = Tile.ROCK
 
     return cave
 
@@ -4,7 +4,7 @@ from typing import Iterable
 
 from tqdm import tqdm
 
-from src.input_util import get_input
+from src.input_util import get_input, parse_cache
 
 EXAMPLE = """Sensor at x=2, y=18: closest beacon is at x=-2, y=15
 Sensor at x=9, y=16: closest beacon is at x=10, y=16
@@ -22,6 +22,18 @@ Sensor at x=14, y=3: closest beacon is at x=15, y=3
 Sensor at x=20, y=1: closest beacon is at x=15, y=3"""
 
 
+SENSOR_PATTERN = re.compile(r'Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)')
+
+
+@parse_cache
+def parse_sensors(input_data: str) -> list[tuple[int, int, int, int]]:
+    """Sensor x, sensor y, beacon x, beacon y"""
+    return [
+        tuple(map(int, SENSOR_PATTERN.match(line).groups()))
+        for line in input_data.split('\n')
+    ]
+
+
 def manhattan_distance(x1: int, y1: int, x2: int, y2: int) -> int:
     return abs(x1 - x2) + abs(y1 - y2)
 
@@ -48,9 +60,7 @@ def calculate_overlap(x1: int, y1: int, d1: int, x2: int, y2: int, d2: int) -> i
 
 def total_unavailable_spots(input_data: str) -> int:
     sensors_and_distances: list[tuple[int, int, int]] = []
-    for line in input_data.split('\n'):
-        match = re.match(r'Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)', line)
-        sensor_x, sensor_y, beacon_x, beacon_y = map(int, match.groups())
+    for sensor_x, sensor_y, beacon_x, beacon_y in parse_sensors(input_data):
         sensors_and_distances.append((sensor_x, sensor_y, manhattan_distance(sensor_x, sensor_y, beacon_x, beacon_y)))
 
     unavailable_spots = sum(sum(range(n + 1)) * n for _, _, n in sensors_and_distances)
@@ -62,15 +72,13 @@ def total_unavailable_spots(input_data: str) -> int:
     return unavailable_spots
 
 
-def part1(input_data: str, y: int) -> int:
+def part1(input_data: str, y: int = 2000000) -> int:
     unavailable_spots = 0
 
     # Parse
     sensors_and_distances: list[tuple[int, int, int]] = []
     beacon_xs = set()
-    for line in input_data.split('\n'):
-        match = re.match(r'Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)', line)
-        sensor_x, sensor_y, beacon_x, beacon_y = map(int, match.groups())
+    for sensor_x, sensor_y, beacon_x, beacon_y in parse_sensors(input_data):
         sensors_and_distances.append((sensor_x, sensor_y, manhattan_distance(sensor_x, sensor_y, beacon_x, beacon_y)))
         if beacon_y == y:
             beacon_xs.add(beacon_x)
@@ -105,12 +113,10 @@ def sensor_boundaries(x: int, y: int, d: int) -> Iterable[tuple[int, int]]:
         yield x + offset, y - d + abs(offset) - 1
 
 
-def part2(input_data: str, max_co: int) -> int:
+def part2(input_data: str, max_co: int = 4000000) -> int:
     # Parse
     sensors_and_distances: list[tuple[int, int, int]] = []
-    for line in input_data.split('\n'):
-        match = re.match(r'Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)', line)
-        sensor_x, sensor_y, beacon_x, beacon_y = map(int, match.groups())
+    for sensor_x, sensor_y, beacon_x, beacon_y in parse_sensors(input_data):
         distance = manhattan_distance(sensor_x, sensor_y, beacon_x, beacon_y)
         sensors_and_distances.append((sensor_x, sensor_y, distance))
 
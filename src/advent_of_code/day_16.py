@@ -23,11 +23,14 @@ class Valve:
     neighbours: list[str]
 
 
+VALVE_PATTERN = re.compile(r'Valve ([A-Z]+) has flow rate=(\d+); tunnels? leads? to valves? (.*)')
+
+
 def parse_valves(input_data: str) -> dict[str, Valve]:
     """name to (pressure, [neighbours])"""
     valves = {}
     for line in input_data.split('\n'):
-        match = re.match(r'Valve ([A-Z]+) has flow rate=(\d+); tunnels? leads? to valves? (.*)', line)
+        match = VALVE_PATTERN.match(line)
         name, rate, neighbours = match.groups()
         valve = Valve(name, int(rate), neighbours.split(', '))
         valves[valve.name] = valve
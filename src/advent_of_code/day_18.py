@@ -1,4 +1,7 @@
-from src.input_util import get_input
+import numpy as np
+
+from src.grid_util import ORTHOGONAL_3D, Grid, shift
+from src.input_util import get_input, parse_cache
 
 EXAMPLE = """2,2,2
 1,2,2
@@ -15,104 +18,40 @@ EXAMPLE = """2,2,2
 2,3,5"""
 
 
-def parse(input_data: str, shift: bool) -> tuple[set[tuple[int, int, int]], int, int, int]:
-    # Parse
-    positions = {tuple(int(i) for i in line.split(',')) for line in input_data.split('\n')}
-    min_x, max_x = min(p[0] for p in positions), max(p[0] for p in positions)
-    min_y, max_y = min(p[1] for p in positions), max(p[1] for p in positions)
-    min_z, max_z = min(p[2] for p in positions), max(p[2] for p in positions)
+@parse_cache
+def parse(input_data: str) -> Grid:
+    """The cubes of lava as 1. Padded with air on every side, so all the air outside of the droplet is connected."""
+    positions = np.array([line.split(',') for line in input_data.split('\n')], dtype=np.int64)
+    positions -= positions.min(axis=0) - 1
+    return Grid.from_positions(positions, shape=tuple(positions.max(axis=0) + 2))
 
-    if shift:
-        # Shift to O ... n
-        positions = {(x - min_x, y - min_y, z - min_z) for x, y, z in positions}
-        min_x, max_x = min(p[0] for p in positions), max(p[0] for p in positions)
-        min_y, max_y = min(p[1] for p in positions), max(p[1] for p in positions)
-        min_z, max_z = min(p[2] for p in positions), max(p[2] for p in positions)
 
-    return positions, max_x, max_y, max_z
+def surface(lava: np.ndarray, air: np.ndarray) -> int:
+    """The number of sides of lava cubes that touch the air"""
+    return sum(int((lava & shift(air, offset)).sum()) for offset in ORTHOGONAL_3D)
 
 
 def part1(input_data: str):
-    positions, max_x, max_y, max_z = parse(input_data, shift=True)
-
-    surfaces = [[[0] * (max_z + 1) for _ in range(max_y + 1)] for _ in range(max_x + 1)]
-    for x, y, z in positions:
-        surfaces[x][y][z] += 6
-        if x > 0:
-            surfaces[x - 1][y][z] -= 1
-        if y > 0:
-            surfaces[x][y - 1][z] -= 1
-        if z > 0:
-            surfaces[x][y][z - 1] -= 1
-        if x < max_x:
-            surfaces[x + 1][y][z] -= 1
-        if y < max_y:
-            surfaces[x][y + 1][z] -= 1
-        if z < max_z:
-            surfaces[x][y][z + 1] -= 1
-
-    return sum(s for rows in surfaces for columns in rows for s in columns if s > 0)
+    lava = parse(input_data).cells == 1
+    return surface(lava, ~lava)
 
 
 def part2(input_data: str):
-    positions, max_x, max_y, max_z = parse(input_data, shift=False)
-
-    # Check what the fresh air can reach
-    can_reach_fresh_air = set()
-    to_check = [(x, y, max_z) for x in range(max_x + 1) for y in range(max_y + 1)]
-    while to_check:
-        x, y, z = to_check.pop()
-        if (x, y, z) in can_reach_fresh_air:
-            continue
-        can_reach_fresh_air.add((x, y, z))
-
-        if (x, y, z) not in positions:
-            if x > 0:
-                to_check.append((x - 1, y, z))
-            if y > 0:
-                to_check.append((x, y - 1, z))
-            if z > 0:
-                to_check.append((x, y, z - 1))
-            if x < max_x:
-                to_check.append((x + 1, y, z))
-            if y < max_y:
-                to_check.append((x, y + 1, z))
-            if z < max_z:
-                to_check.append((x, y, z + 1))
-
-    # Regular
-    surfaces = [[[0] * (max_z + 1) for _ in range(max_y + 1)] for _ in range(max_x + 1)]
-    for x, y, z in positions:
-        surfaces[x][y][z] += 6
-        if x > 0:
-            surfaces[x - 1][y][z] -= 1
-        if y > 0:
-            surfaces[x][y - 1][z] -= 1
-        if z > 0:
-            surfaces[x][y][z - 1] -= 1
-        if x < max_x:
-            surfaces[x + 1][y][z] -= 1
-        if y < max_y:
-            surfaces[x][y + 1][z] -= 1
-        if z < max_z:
-            surfaces[x][y][z + 1] -= 1
-
-    # For every isolated piece of air, subtract 1 of each of its neighbours
-    for x, y, z in {(x, y, z) for x in range(max_x + 1) for y in range(max_y + 1) for z in range(max_z + 1)} - can_reach_fresh_air - positions:
-        if x > 0:
-            surfaces[x - 1][y][z] -= 1
-        if y > 0:
-            surfaces[x][y - 1][z] -= 1
-        if z > 0:
-            surfaces[x][y][z - 1] -= 1
-        if x < max_x:
-            surfaces[x + 1][y][z] -= 1
-        if y < max_y:
-            surfaces[x][y + 1][z] -= 1
-        if z < max_z:
-            surfaces[x][y][z + 1] -= 1
-
-    return sum(s for rows in surfaces for columns in rows for s in columns if s > 0)
+    lava = parse(input_data).cells == 1
+
+    # Check what the fresh air can reach, spreading from a corner of the padding until it stops growing
+    fresh_air = np.zeros(lava.shape, dtype=bool)
+    fresh_air[0, 0, 0] = True
+    while True:
+        spread = fresh_air.copy()
+        for offset in ORTHOGONAL_3D:
+            spread |= shift(fresh_air, offset)
+        spread &= ~lava
+        if np.array_equal(spread, fresh_air):
+            break
+        fresh_air = spread
+
+    return surface(lava, fresh_air)
 
 
 if __name__ == '__main__':
@@ -6,7 +6,7 @@ from enum import Enum
 from tqdm import tqdm
 
 from src.input_util import get_input
-from src.timer_util import ContextTimer
+from src.timer_util import ContextTimer, profiled
 
 EXAMPLE = """Blueprint 1:
   Each ore robot costs 4 ore.
@@ -63,14 +63,18 @@ class State:
         return f'Items: [{", ".join(str(self.items[i]) for i in Item)}], Robots: [{", ".join(str(self.robots[i]) for i in Item)}]'
 
 
+BLUEPRINT_PATTERN = re.compile(r'Blueprint (\d+): Each ore robot costs (\d+) ore. Each clay robot costs (\d+) ore. Each obsidian robot costs (\d+) ore and (\d+) clay. Each geode robot costs (\d+) ore and (\d+) obsidian.')
+
+
 def example_to_input(input_data: str) -> str:
     return '\n'.join([s.replace('\n', '').replace('  ', ' ') for s in input_data.split('\n\n')])
 
 
+@profiled()
 def parse_blueprints(input_data: str) -> list[Blueprint]:
     blueprints = []
     for line in input_data.split('\n'):
-        match = re.match(r'Blueprint (\d+): Each ore robot costs (\d+) ore. Each clay robot costs (\d+) ore. Each obsidian robot costs (\d+) ore and (\d+) clay. Each geode robot costs (\d+) ore and (\d+) obsidian.', line)
+        match = BLUEPRINT_PATTERN.match(line)
         blueprints.append(Blueprint(
             int(match.group(1)),
             {
@@ -89,6 +93,7 @@ class Backtracking:
         self.blueprint = blueprint
         self.max_geodes = 0
 
+    @profiled('search')
     def best_score(self, time: int) -> int:
         state = State({item: 0 for item in Item}, {item: 0 for item in Item} | {Item.ORE: 1}, self.blueprint)
         self.max_geodes = 0
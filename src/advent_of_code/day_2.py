@@ -1,6 +1,8 @@
 from enum import IntEnum
 
-from src.input_util import get_input
+import numpy as np
+
+from src.input_util import InputData, map_input
 
 
 class Result(IntEnum):
@@ -72,25 +74,39 @@ def what_should_i_pick(other: RPC, result: Result) -> RPC:
         return this_beats_that(move_that_looses)
 
 
-def part1(input_data: str):
-    total_score = 0
-    for line in input_data.split('\n'):
-        if line:
-            other, me = RPC.from_char(line[0]), RPC.from_char(line[2])
-            total_score += score_for_round(me, other)
-    return total_score
+# The score of every possible round, indexed by its code: the opponent's move * 3 + the second column
+SCORES_PART_1 = np.array([score_for_round(RPC.from_char(char), other) for other in RPC for char in 'XYZ'])
+SCORES_PART_2 = np.array([score_for_round(what_should_i_pick(other, Result.from_char(char)), other) for other in RPC for char in 'XYZ'])
+
+
+def count_rounds(input_data: InputData) -> np.ndarray:
+    """
+    How often every round occurs, indexed by its code.
+    Every round is a line of 4 bytes like 'A X\n', so the columns are strided views of the raw bytes and are counted
+    without splitting the lines.
+    """
+    data = np.frombuffer(input_data.encode('ascii') if isinstance(input_data, str) else input_data, dtype=np.uint8)
+    end = len(data)
+    while end and data[end - 1] == ord('\n'):
+        end -= 1
+    data = data[:end]
+    if (end + 1) % 4 or (data[1::4] != ord(' ')).any() or (data[3::4] != ord('\n')).any():
+        raise ValueError('Expected lines like "A X"')
+    others, mine = data[0::4] - np.uint8(ord('A')), data[2::4] - np.uint8(ord('X'))
+    if (others > 2).any() or (mine > 2).any():
+        raise ValueError('Expected lines like "A X"')
+    return np.bincount(others * 3 + mine, minlength=9)
+
+
+def part1(input_data: InputData):
+    return int(count_rounds(input_data) @ SCORES_PART_1)
 
 
-def part2(input_data: str):
-    total_score = 0
-    for line in input_data.split('\n'):
-        if line:
-            other, result = RPC.from_char(line[0]), Result.from_char(line[2])
-            me = what_should_i_pick(other, result)
-            total_score += score_for_round(me, other)
-    return total_score
+def part2(input_data: InputData):
+    return int(count_rounds(input_data) @ SCORES_PART_2)
 
 
 if __name__ == '__main__':
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    with map_input() as input_data:
+        print(f'Solution for part 1 is: {part1(input_data)}')
+        print(f'Solution for part 2 is: {part2(input_data)}')
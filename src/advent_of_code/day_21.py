@@ -21,12 +21,16 @@ drzm: hmdt - zczc
 hmdt: 32"""
 
 
+VALUE_PATTERN = re.compile(r'(.*): (\d+)')
+OPERATION_PATTERN = re.compile(r'(.*): (.*) (.) (.*)')
+
+
 def parse(input_data: str) -> tuple[dict[str, set[str]], dict[str, int], dict[str, list[tuple[Callable[[int, int], int], str, str]]]]:
     dependencies, values, operations = defaultdict(set), {}, defaultdict(list)
     for line in input_data.split('\n'):
-        if match := re.match(r'(.*): (\d+)', line):
+        if match := VALUE_PATTERN.match(line):
             values[match.group(1)] = int(match.group(2))
-        elif match := re.match(r'(.*): (.*) (.) (.*)', line):
+        elif match := OPERATION_PATTERN.match(line):
             derived_lines = [line]
             match match.groups():
                 case [name, a, '+', b]:
@@ -42,7 +46,7 @@ def parse(input_data: str) -> tuple[dict[str, set[str]], dict[str, int], dict[st
                     derived_lines.append(f'{a}: {name} * {b}')
                     derived_lines.append(f'{b}: {a} / {name}')
             for derived_line in derived_lines:
-                match = re.match(r'(.*): (.*) (.) (.*)', derived_line)
+                match = OPERATION_PATTERN.match(derived_line)
                 dependencies[match.group(2)].add(match.group(1))
                 dependencies[match.group(4)].add(match.group(1))
                 operations[match.group(1)].append((
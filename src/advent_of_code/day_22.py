@@ -1,9 +1,13 @@
 import abc
 import dataclasses
 import re
-from enum import Enum
+from enum import IntEnum
 
-from src.input_util import get_input
+import numpy as np
+
+from src.direction_util import ARROWS, DELTAS, TURN_RIGHT, TURNS, Direction
+from src.grid_util import Grid
+from src.input_util import get_input, parse_cache
 
 EXAMPLE = """        ...#
         .#..
@@ -21,31 +25,6 @@ EXAMPLE = """        ...#
 10R5L5R10L4R5L5"""
 
 
-class Direction(Enum):
-    RIGHT = 0
-    DOWN = 1
-    LEFT = 2
-    UP = 3
-
-    def rotate(self, d: str) -> 'Direction':
-        if d == 'R':
-            return Direction((self.value + 1) % len(Direction))
-        else:
-            return Direction((self.value - 1) % len(Direction))
-
-    def opposite(self) -> 'Direction':
-        return self.rotate('R').rotate('R')
-
-    @property
-    def pretty(self) -> str:
-        return {
-            Direction.RIGHT: '>',
-            Direction.LEFT: '<',
-            Direction.UP: '^',
-            Direction.DOWN: 'v',
-        }[self]
-
-
 """
   0
 123
@@ -138,10 +117,13 @@ MAPPING_INPUT: dict[int, dict[Direction, tuple[int, Direction]]] = {
 }
 
 
-class Tile(Enum):
-    GROUND = '.'
-    WALL = '#'
-    OUT_OF_BOUNDS = ' '
+class Tile(IntEnum):
+    OUT_OF_BOUNDS = 0
+    GROUND = 1
+    WALL = 2
+
+
+TILE_CHARS = ' .#'
 
 
 @dataclasses.dataclass
@@ -150,13 +132,11 @@ class Move:
     steps: int
 
 
-def parse(input_data: str) -> tuple[list[list[Tile]], list[Move]]:
-    """Parse the input. Also adds trailing ' ' to the shorter rows"""
+@parse_cache
+def parse(input_data: str) -> tuple[Grid, list[Move]]:
+    """Parse the input. The shorter rows are padded with out of bounds tiles"""
     tiles_str, instructions_str = input_data.split('\n\n')
-    tiles = [[Tile(t) for t in row] for row in tiles_str.split('\n')]
-    max_row_size = max(len(row) for row in tiles)
-    for row in tiles:
-        row.extend([Tile.OUT_OF_BOUNDS] * (max_row_size - len(row)))
+    tiles = Grid.parse(tiles_str, {char: tile for tile, char in zip(Tile, TILE_CHARS)})
     moves = [Move(r or None, int(v)) for r, v in re.findall(r'(^|L|R)(\d+)', instructions_str)]
     return tiles, moves
 
@@ -173,24 +153,26 @@ class Area(abc.ABC):
     Subclasses have to implement next_position()
     """
 
-    tiles: list[list[Tile]]
+    tiles: Grid
     history: dict[tuple[int, int], Direction] = dataclasses.field(default_factory=dict)
     current_position: tuple[int, int] = dataclasses.field(init=False)
     current_direction: Direction = dataclasses.field(init=False)
+    _flat_tiles: memoryview = dataclasses.field(init=False, repr=False)
 
     def __post_init__(self):
-        self.current_position = next(iter((i, j) for i, row in enumerate(self.tiles) for j, tile in enumerate(row) if tile == Tile.GROUND))
+        self.current_position = tuple(np.argwhere(self.tiles.cells == Tile.GROUND)[0].tolist())
+        self._flat_tiles = self.tiles.flat()
         self.current_direction = Direction.RIGHT
         self.update_history()
 
     def visualize(self) -> str:
         s = ''
-        for i, row in enumerate(self.tiles):
+        for i, row in enumerate(self.tiles.cells.tolist()):
             for j, tile in enumerate(row):
-                if direction := self.history.get((i, j)):
-                    s += direction.pretty
+                if (direction := self.history.get((i, j))) is not None:
+                    s += ARROWS[direction]
                 else:
-                    s += tile.value
+                    s += TILE_CHARS[tile]
             s += '\n'
         return s
 
@@ -205,13 +187,15 @@ class Area(abc.ABC):
 
     def advance(self, move: Move):
         if move.rotation:
-            self.current_direction = self.current_direction.rotate(move.rotation)
+            self.current_direction = TURNS[move.rotation][self.current_direction]
             self.update_history()
+        width = self.tiles.shape[1]
         for _ in range(move.steps):
             next_x, next_y, next_direction = self.next_position()
-            if self.tiles[next_x][next_y] == Tile.OUT_OF_BOUNDS:
+            tile = self._flat_tiles[next_x * width + next_y]
+            if tile == Tile.OUT_OF_BOUNDS:
                 raise Exception()
-            if self.tiles[next_x][next_y] == Tile.WALL:
+            if tile == Tile.WALL:
                 break
             self.current_position = next_x, next_y
             self.current_direction = next_direction
@@ -231,42 +215,29 @@ class Area1(Area):
 
     def __post_init__(self):
         super().__post_init__()
-        # Calculate boundaries
-        self.row_to_boundaries = {
-            i: (
-                min(j for j, tile in enumerate(row) if tile != Tile.OUT_OF_BOUNDS),
-                max(j for j, tile in enumerate(row) if tile != Tile.OUT_OF_BOUNDS)
-            )
-            for i, row in enumerate(self.tiles)
-        }
-        self.column_to_boundaries = {
-            j: (
-                min(i for i, row in enumerate(self.tiles) if row[j] != Tile.OUT_OF_BOUNDS),
-                max(i for i, row in enumerate(self.tiles) if row[j] != Tile.OUT_OF_BOUNDS),
-            )
-            for j in range(len(self.tiles[0]))
-        }
+        # Calculate boundaries: the first and last tile that is in bounds, of every row and column
+        in_bounds = self.tiles.cells != Tile.OUT_OF_BOUNDS
+        height, width = in_bounds.shape
+        self.row_to_boundaries = dict(enumerate(zip(
+            in_bounds.argmax(axis=1).tolist(),
+            (width - 1 - in_bounds[:, ::-1].argmax(axis=1)).tolist(),
+        )))
+        self.column_to_boundaries = dict(enumerate(zip(
+            in_bounds.argmax(axis=0).tolist(),
+            (height - 1 - in_bounds[::-1].argmax(axis=0)).tolist(),
+        )))
 
     def next_position(self) -> tuple[int, int, Direction]:
-        match self.current_direction:
-            case Direction.RIGHT:
-                next_x, next_y = self.current_position[0], self.current_position[1] + 1
-                if next_y > self.row_to_boundaries[next_x][1]:
-                    next_y = self.row_to_boundaries[next_x][0]
-            case Direction.LEFT:
-                next_x, next_y = self.current_position[0], self.current_position[1] - 1
-                if next_y < self.row_to_boundaries[next_x][0]:
-                    next_y = self.row_to_boundaries[next_x][1]
-            case Direction.UP:
-                next_x, next_y = self.current_position[0] - 1, self.current_position[1]
-                if next_x < self.column_to_boundaries[next_y][0]:
-                    next_x = self.column_to_boundaries[next_y][1]
-            case Direction.DOWN:
-                next_x, next_y = self.current_position[0] + 1, self.current_position[1]
-                if next_x > self.column_to_boundaries[next_y][1]:
-                    next_x = self.column_to_boundaries[next_y][0]
-            case _:
-                raise ValueError()
+        delta_x, delta_y = DELTAS[self.current_direction]
+        next_x, next_y = self.current_position[0] + delta_x, self.current_position[1] + delta_y
+        if delta_x:
+            first, last = self.column_to_boundaries[next_y]
+            if not first <= next_x <= last:
+                next_x = first if delta_x > 0 else last
+        else:
+            first, last = self.row_to_boundaries[next_x]
+            if not first <= next_y <= last:
+                next_y = first if delta_y > 0 else last
         return next_x, next_y, self.current_direction
 
 
@@ -281,11 +252,11 @@ class Area2(Area):
 
     mapping: dict[int, dict[Direction, tuple[int, Direction]]]
     tile_size: int
-    index_to_tiles: dict[int, list[list[Tile]]] = dataclasses.field(init=False)  # tile index to the subset of the tiles
+    index_to_tiles: dict[int, np.ndarray] = dataclasses.field(init=False)  # tile index to the subset of the tiles
     index_to_position: dict[int, tuple[int, int]] = dataclasses.field(init=False)  # tile index to coordinate of the top left corner
     tile_map: list[list[int | None]] = dataclasses.field(init=False)  # grid with tile indices. E.g. [[None, None, 0, None], [1, 2, 3, None], [None, None, 4, 5]]
 
-    def __init__(self, tiles: list[list[Tile]], mapping: dict[int, dict[Direction, tuple[int, Direction]]], face_size: int):
+    def __init__(self, tiles: Grid, mapping: dict[int, dict[Direction, tuple[int, Direction]]], face_size: int):
         super().__init__(tiles)
 
         self.mapping = mapping
@@ -295,11 +266,11 @@ class Area2(Area):
         self.index_to_tiles = {}
         self.index_to_position = {}
         index = 0
-        for i in range(len(self.tiles) // self.tile_size):
+        for i in range(self.tiles.shape[0] // self.tile_size):
             self.tile_map.append([])
-            for j in range(len(self.tiles[0]) // self.tile_size):
-                if self.tiles[i * self.tile_size][j * self.tile_size] != Tile.OUT_OF_BOUNDS:
-                    self.index_to_tiles[index] = [row[j * self.tile_size:(j + 1) * self.tile_size] for row in self.tiles[i * self.tile_size:(i + 1) * self.tile_size]]
+            for j in range(self.tiles.shape[1] // self.tile_size):
+                if self.tiles[i * self.tile_size, j * self.tile_size] != Tile.OUT_OF_BOUNDS:
+                    self.index_to_tiles[index] = self.tiles[i * self.tile_size:(i + 1) * self.tile_size, j * self.tile_size:(j + 1) * self.tile_size]
                     self.tile_map[-1].append(index)
                     self.index_to_position[index] = i, j
                     index += 1
@@ -308,19 +279,11 @@ class Area2(Area):
 
     def next_position(self) -> tuple[int, int, Direction]:
         current_tile_index = self.tile_map[self.current_position[0] // self.tile_size][self.current_position[1] // self.tile_size]
-        match self.current_direction:
-            case Direction.RIGHT:
-                next_x, next_y = self.current_position[0], self.current_position[1] + 1
-            case Direction.LEFT:
-                next_x, next_y = self.current_position[0], self.current_position[1] - 1
-            case Direction.UP:
-                next_x, next_y = self.current_position[0] - 1, self.current_position[1]
-            case Direction.DOWN:
-                next_x, next_y = self.current_position[0] + 1, self.current_position[1]
-            case _:
-                raise ValueError()
-        next_x %= len(self.tiles)
-        next_y %= len(self.tiles[0])
+        delta_x, delta_y = DELTAS[self.current_direction]
+        next_x, next_y = self.current_position[0] + delta_x, self.current_position[1] + delta_y
+        height, width = self.tiles.shape
+        next_x %= height
+        next_y %= width
         next_direction = self.current_direction
 
         new_tile_index = self.tile_map[next_x // self.tile_size][next_y // self.tile_size]  # Tile index if we would execute this move, disregarding the cube
@@ -332,7 +295,7 @@ class Area2(Area):
             tmp = self.current_direction
             while tmp != next_direction:
                 # When entering the next tile with different direction, need to rotate the coordinates as well
-                tmp = tmp.rotate('R')
+                tmp = TURN_RIGHT[tmp]
                 next_x_rel, next_y_rel = next_y_rel, self.tile_size - next_x_rel - 1
             next_x = next_x_rel + self.index_to_position[next_tile_index][0] * self.tile_size
             next_y = next_y_rel + self.index_to_position[next_tile_index][1] * self.tile_size
@@ -373,8 +336,8 @@ def part2(input_data: str, face_size: int = 50, mapping: dict[int, dict[Directio
 
 
 if __name__ == '__main__':
-    assert Direction.RIGHT.rotate('R') == Direction.DOWN
-    assert Direction.RIGHT.rotate('L') == Direction.UP
+    assert TURNS['R'][Direction.RIGHT] == Direction.DOWN
+    assert TURNS['L'][Direction.RIGHT] == Direction.UP
     assert part1_area(EXAMPLE).visualize() == """        >>v#    
         .#v.    
         #.v.    
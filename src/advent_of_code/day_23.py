@@ -1,7 +1,8 @@
 import itertools
-from collections import defaultdict
-from typing import Iterator
 
+import numpy as np
+
+from src.grid_util import ALL_2D, Grid, shift
 from src.input_util import get_input
 from src.timer_util import ContextTimer
 
@@ -14,89 +15,79 @@ EXAMPLE = """....#..
 .#..#.."""
 
 
-def parse(input_data: str) -> set[tuple[int, int]]:
-    positions = set()
-    for i, line in enumerate(input_data.split('\n')):
-        for j, char in enumerate(line):
-            if char == '#':
-                positions.add((i, j))
-    return positions
-
-
-def neighbours(x: int, y: int) -> Iterator[tuple[int, int]]:
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i or j:
-                yield x + i, y + j
-
-
-def move(positions: set[tuple[int, int]], x: int, y: int, iteration: int) -> tuple[int, int] | None:
-    for direction in range(iteration, iteration + 4):
-        if direction % 4 == 0 and (x - 1, y - 1) not in positions and (x - 1, y) not in positions and (x - 1, y + 1) not in positions:
-            # Move north
-            return x - 1, y
-        if direction % 4 == 1 and (x + 1, y - 1) not in positions and (x + 1, y) not in positions and (x + 1, y + 1) not in positions:
-            # Move south
-            return x + 1, y
-        if direction % 4 == 2 and (x - 1, y - 1) not in positions and (x, y - 1) not in positions and (x + 1, y - 1) not in positions:
-            # Move west
-            return x, y - 1
-        if direction % 4 == 3 and (x - 1, y + 1) not in positions and (x, y + 1) not in positions and (x + 1, y + 1) not in positions:
-            # Move east
-            return x, y + 1
-    return None
-
-
-def simulate(positions: set[tuple[int, int]], iterations: int | None) -> int | None:
-    initial_number_positions = len(positions)
+ELF = 1
+
+# Per direction, in the order they are considered in the first round: the neighbours that have to be free, and the step
+DIRECTIONS = [
+    (((-1, -1), (-1, 0), (-1, 1)), (-1, 0)),  # north
+    (((1, -1), (1, 0), (1, 1)), (1, 0)),  # south
+    (((-1, -1), (0, -1), (1, -1)), (0, -1)),  # west
+    (((-1, 1), (0, 1), (1, 1)), (0, 1)),  # east
+]
+
+
+def parse(input_data: str) -> Grid:
+    return Grid.parse(input_data, {'.': 0, '#': ELF})
+
+
+def simulate(grid: Grid, iterations: int | None) -> int | None:
+    """
+    Moves all elves at once, a round at a time. Returns the first round in which no elf moved.
+    The grid grows when the elves get close to its border.
+    """
+    initial_number_elves = int((grid.cells == ELF).sum())
     for iteration in itertools.count() if iterations is None else range(iterations):
-        moves: dict[tuple[int, int], tuple[int, int]] = {}
-        targets: dict[tuple[int, int], int] = defaultdict(int)
-        for position in positions:
-            if any(n in positions for n in neighbours(*position)) and (target := move(positions, *position, iteration)):
-                assert target not in positions
-                moves[position] = target
-                targets[target] += 1
-        if not moves:
+        elves = grid.cells == ELF
+        if elves[[0, -1]].any() or elves[:, [0, -1]].any():
+            grid.cells = np.pad(grid.cells, 10)
+            elves = grid.cells == ELF
+
+        # Every elf with a neighbour proposes the first direction in which the three neighbours are free
+        undecided = elves & (grid.count_neighbours(ELF, ALL_2D) > 0)
+        proposals = []
+        for direction in range(iteration, iteration + 4):
+            neighbours, step = DIRECTIONS[direction % 4]
+            free = ~(shift(elves, neighbours[0]) | shift(elves, neighbours[1]) | shift(elves, neighbours[2]))
+            proposing = undecided & free
+            undecided &= ~free
+            proposals.append((step, shift(proposing, (-step[0], -step[1]))))
+        if not any(targets.any() for _, targets in proposals):
             return iteration
-        for move_from, move_to in moves.items():
-            if targets[move_to] == 1:
-                positions.remove(move_from)
-                positions.add(move_to)
-        assert len(positions) == initial_number_positions
-        # print(visualize(positions))
-        # print()
-
-
-def visualize(positions: set[tuple[int, int]]) -> str:
-    min_x, max_x, min_y, max_y = min(p[0] for p in positions), max(p[0] for p in positions), min(p[1] for p in positions), max(p[1] for p in positions)
-    s = ''
-    for x in range(min_x, max_x + 1):
-        for y in range(min_y, max_y + 1):
-            if (x, y) in positions:
-                s += '#'
-            else:
-                s += '.'
-        s += '\n'
-    return s[:-1]
-
-
-def execute_part_1(input_data: str, iterations: int = 10) -> set[tuple[int, int]]:
-    positions = parse(input_data)
-    simulate(positions, iterations)
-    return positions
+
+        # Only move to the positions that a single elf proposed
+        proposed = sum(targets.astype(np.uint8) for _, targets in proposals)
+        for step, targets in proposals:
+            targets &= proposed == 1
+            elves &= ~shift(targets, step)
+            elves |= targets
+        grid.cells = elves.astype(np.uint8)
+        assert int(elves.sum()) == initial_number_elves
+
+
+def bounding_box(grid: Grid) -> Grid:
+    rows, columns = np.nonzero(grid.cells == ELF)
+    return Grid(grid.cells[rows.min():rows.max() + 1, columns.min():columns.max() + 1])
+
+
+def visualize(grid: Grid) -> str:
+    return bounding_box(grid).to_text('.#')
+
+
+def execute_part_1(input_data: str, iterations: int = 10) -> Grid:
+    grid = parse(input_data)
+    simulate(grid, iterations)
+    return grid
 
 
 def part1(input_data: str):
-    positions = execute_part_1(input_data)
-    # print(visualize(positions))
-    min_x, max_x, min_y, max_y = min(p[0] for p in positions), max(p[0] for p in positions), min(p[1] for p in positions), max(p[1] for p in positions)
-    return (max_x - min_x + 1) * (max_y - min_y + 1) - len(positions)
+    grid = bounding_box(execute_part_1(input_data))
+    # print(visualize(grid))
+    return int((grid.cells != ELF).sum())
 
 
 def part2(input_data: str):
-    positions = parse(input_data)
-    return simulate(positions, None) + 1
+    grid = parse(input_data)
+    return simulate(grid, None) + 1
 
 
 if __name__ == '__main__':
@@ -126,4 +117,4 @@ if __name__ == '__main__':
     print(f'Solution for part 1 is: {part1(get_input())}')
     assert part2(EXAMPLE) == 20
     with ContextTimer():
-        print(f'Solution for part 2 is: {part2(get_input())}')  # takes about 7 seconds
+        print(f'Solution for part 2 is: {part2(get_input())}')
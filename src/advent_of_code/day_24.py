@@ -1,12 +1,16 @@
 import dataclasses
 import math
-from collections import defaultdict
-from enum import Enum
+from enum import IntEnum
+from typing import Iterator
 
+import numpy as np
 from tqdm import tqdm
 
+from src.direction_util import ARROWS, DELTAS, Direction, flat_deltas
+from src.grid_util import Grid
 from src.input_util import get_input
-from src.timer_util import ContextTimer
+from src.search_util import Bitset, Packing, bfs
+from src.timer_util import ContextTimer, profiled, span
 
 EXAMPLE = """#.######
 #>>.<^<#
@@ -16,37 +20,10 @@ EXAMPLE = """#.######
 ######.#"""
 
 
-class Direction(Enum):
-    UP = '^'
-    DOWN = 'v'
-    LEFT = '<'
-    RIGHT = '>'
-
-
-@dataclasses.dataclass
-class Blizzard:
-    direction: Direction
-    position: tuple[int, int]
-
-
-class Tile(Enum):
-    WALL = '#'
-    GROUND = '.'
-    BLIZZARD = 'x'
-
-
-def advance(x: int, y: int, direction: Direction) -> tuple[int, int]:
-    match direction:
-        case Direction.UP:
-            return x - 1, y
-        case Direction.DOWN:
-            return x + 1, y
-        case Direction.LEFT:
-            return x, y - 1
-        case Direction.RIGHT:
-            return x, y + 1
-        case _:
-            raise ValueError()
+class Tile(IntEnum):
+    GROUND = 0
+    WALL = 1
+    BLIZZARD = 2
 
 
 @dataclasses.dataclass
@@ -54,172 +31,124 @@ class Area:
     """
     A representation of the field at a given moment.
     tiles: the whole grid
-    blizzards: specific information about every individual blizzard. Its direction and coordinates
+    blizzards: a layer per direction, in the order of Direction, that is True where a blizzard moving in that direction is
     """
 
-    tiles: list[list[Tile]]
-    blizzards: list[Blizzard]
+    tiles: Grid
+    blizzards: np.ndarray
 
     def advance(self) -> 'Area':
-        """Advance the whole area to the next state. Move all blizzards."""
-        new_tiles = [[Tile.WALL if tile == Tile.WALL else Tile.GROUND for tile in row] for row in self.tiles]
-        new_blizzards = []
-        for blizzard in self.blizzards:
-            new_blizzard = self._advance_blizzard(blizzard)
-            new_blizzards.append(new_blizzard)
-            new_tiles[new_blizzard.position[0]][new_blizzard.position[1]] = Tile.BLIZZARD
-        return Area(new_tiles, new_blizzards)
-
-    def _advance_blizzard(self, blizzard: Blizzard) -> Blizzard:
-        """Move a single blizzard. Returns a new object."""
-        next_x, next_y = advance(*blizzard.position, blizzard.direction)
-        if self.tiles[next_x][next_y] == Tile.WALL:
-            next_x, next_y = advance(next_x, next_y, blizzard.direction)
-            next_x, next_y = advance(next_x, next_y, blizzard.direction)
-        next_x %= len(self.tiles)
-        next_y %= len(self.tiles[0])
-        return Blizzard(blizzard.direction, (next_x, next_y))
+        """Advance the whole area to the next state. Move all blizzards, wrapping around within the walls."""
+        blizzards = self.blizzards.copy()
+        inside = blizzards[:, 1:-1, 1:-1]
+        for direction in Direction:
+            inside[direction] = np.roll(inside[direction], DELTAS[direction], axis=(0, 1))
+        tiles = np.where(blizzards.any(axis=0), Tile.BLIZZARD, Tile.GROUND).astype(np.uint8)
+        tiles[self.tiles.cells == Tile.WALL] = Tile.WALL
+        return Area(Grid(tiles), blizzards)
 
     def visualize(self, current_position: tuple[int, int] | None = None) -> str:
         s = ''
-        for i, row in enumerate(self.tiles):
+        for i, row in enumerate(self.tiles.cells.tolist()):
             for j, tile in enumerate(row):
                 if current_position and current_position == (i, j):
                     s += 'E'
                 elif tile == Tile.BLIZZARD:
-                    blizzards = [b for b in self.blizzards if b.position == (i, j)]
-                    if len(blizzards) == 1:
-                        s += blizzards[0].direction.value
+                    directions = [direction for direction in Direction if self.blizzards[direction, i, j]]
+                    if len(directions) == 1:
+                        s += ARROWS[directions[0]]
                     else:
-                        s += str(min(len(blizzards), 9))
+                        s += str(min(len(directions), 9))
                 else:
-                    s += tile.value
+                    s += '#' if tile == Tile.WALL else '.'
             s += '\n'
         return s[:-1]
 
 
-class Backtracking:
+class Expedition:
 
     def __init__(self, init_area: Area):
         # Least common multiple of the width and length (excluding the walls)
         # All areas modulo `lcm` are identical. We only need to calculate the `lcm` distinct areas
-        self.lcm = math.lcm(len(init_area.tiles) - 2, len(init_area.tiles[0]) - 2)
+        self.lcm = math.lcm(init_area.tiles.shape[0] - 2, init_area.tiles.shape[1] - 2)
         self._areas = [init_area]
-        for _ in tqdm(range(self.lcm - 1), desc='Generating areas') if self.lcm > 100 else range(self.lcm - 1):
-            self._areas.append(self._areas[-1].advance())
+        with span('generate areas'):
+            for _ in tqdm(range(self.lcm - 1), desc='Generating areas') if self.lcm > 100 else range(self.lcm - 1):
+                self._areas.append(self._areas[-1].advance())
 
-        self.start = (0, 1)
-        self.finish = (-1 % len(init_area.tiles), -2 % len(init_area.tiles[0]))
-        self.best_case = manhattan_distance(*self.start, *self.finish)
+        # Flat views of the tiles of every area, much faster to index than the arrays
+        self.height, self.width = init_area.tiles.shape
+        self._tiles = [area.tiles.flat() for area in self._areas]
 
-        self.stages: int = None
-        self.stage_to_modulo_to_time_to_explored: dict[int, dict[int, dict[int, set]]] = None
-        self.best_time: int = None
+        self.start = (0, 1)
+        self.finish = (self.height - 1, self.width - 2)
 
     def areas(self, time: int) -> Area:
         # All areas modulo `lcm` are identical
         return self._areas[time % self.lcm]
 
     def fastest_route(self, stages: int = 1) -> int:
-        self.stages = stages
-        self.best_time = 10 ** 10
-        self.stage_to_modulo_to_time_to_explored = defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
-        self._backtrack(0, 0, self.start)
-        return self.best_time
-
-    def _backtrack(self, time: int, stage: int, position: tuple[int, int]):
         """
-        stage: indicating which part of the adventure we are in
+        The least time to go through all stages, each as fast as possible:
           * even: going from start to finish
-          * odd going from finish back to the start
-
-        stage_to_modulo_to_time_to_explored: in order to avoid exploring a specific position on the same time more than once
+          * odd: going from finish back to the start
         """
-
-        goal = self.finish if stage % 2 == 0 else self.start
-
-        if position == goal:
-            # Current stage is finished
-            stage += 1
-            if stage == self.stages:
-                # Done with all stages
-                if time < self.best_time:
-                    # New best
-                    # print(time)
-                    self.best_time = time
-                return
-            goal = self.finish if stage % 2 == 0 else self.start
-
-        # if
-        #  * current stage
-        #  * current position
-        #  * same state of the area (same time % lcm)
-        #  * already explored this with current time (literal exact state)
-        #      or alreadt explored with lower time (literal exact state, but a lcm cycle earlier)
-        # then: skip
-        # else: register this
-        if any(position in v for k, v in self.stage_to_modulo_to_time_to_explored[stage][time % self.lcm].items() if time >= k):
-            return
-        else:
-            self.stage_to_modulo_to_time_to_explored[stage][time % self.lcm][time].add(position)
-
-        # Upper bound using manhattan distance
-        if time + manhattan_distance(*position, *goal) + self.best_case * (self.stages - 1 - stage) > self.best_time:
-            return
-
-        next_area = self.areas(time + 1)
-        order = (
-            [Direction.DOWN, Direction.RIGHT, Direction.UP, Direction.LEFT],  # going to finish: down right first
-            [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT],  # going to start: up left first
-        )[stage % 2]
-        for d in order:
-            next_x, next_y = advance(*position, d)
-            if 0 <= next_x < len(next_area.tiles) and 0 <= next_y < len(next_area.tiles[0]):
-                # If is not out of bounds
-                if next_area.tiles[next_x][next_y] == Tile.GROUND:
-                    # If it's possible to walk to that tile
-                    self._backtrack(time + 1, stage, (next_x, next_y))
-        if next_area.tiles[position[0]][position[1]] == Tile.GROUND:
-            # Stand still
-            self._backtrack(time + 1, stage, position)
-
-
-def manhattan_distance(x1: int, y1: int, x2: int, y2: int) -> int:
-    return abs(x1 - x2) + abs(y1 - y2)
-
-
+        time = 0
+        with span('search'):
+            for stage in range(stages):
+                start, goal = (self.start, self.finish) if stage % 2 == 0 else (self.finish, self.start)
+                time += self._fastest_stage(time, start, goal)
+        return time
+
+    def _fastest_stage(self, time: int, start: tuple[int, int], goal: tuple[int, int]) -> int:
+        """
+        Breadth first over the states (time modulo lcm, position), so every state is explored at most once.
+        A position is a flat index in the tiles. Walls surround the valley, so only the entrance and the exit can step
+        out of the tiles.
+        """
+        cells = self.height * self.width
+        states = Packing(self.lcm, cells)
+        # Stand still, or move in any direction
+        moves = (0,) + flat_deltas(self.width)
+        tiles, lcm = self._tiles, self.lcm
+
+        def neighbours(state: int) -> Iterator[int]:
+            modulo, position = divmod(state, cells)
+            modulo = (modulo + 1) % lcm
+            next_tiles = tiles[modulo]
+            for move in moves:
+                next_position = position + move
+                if 0 <= next_position < cells and next_tiles[next_position] == Tile.GROUND:
+                    yield modulo * cells + next_position
+
+        goal = goal[0] * self.width + goal[1]
+        first = states.pack(time % lcm, start[0] * self.width + start[1])
+        for state, duration in bfs([first], neighbours, Bitset(states.size)):
+            if state % cells == goal:
+                return duration
+        raise ValueError(f'The goal can not be reached from {start}')
+
+
+@profiled()
 def parse(input_data: str) -> Area:
-    tiles = []
-    blizzards = []
-    for i, row in enumerate(input_data.split('\n')):
-        tiles.append([])
-        for j, char in enumerate(row):
-            try:
-                direction = Direction(char)
-                tile = Tile.BLIZZARD
-                blizzards.append(Blizzard(direction, (i, j)))
-            except ValueError:
-                tile = Tile(char)
-            tiles[-1].append(tile)
+    tiles = Grid.parse(input_data, {'#': Tile.WALL, '.': Tile.GROUND} | {arrow: Tile.BLIZZARD for arrow in ARROWS})
+    chars = Grid.parse(input_data)
+    blizzards = np.stack([chars.cells == ord(arrow) for arrow in ARROWS])
     return Area(tiles, blizzards)
 
 
 def part1(input_data: str):
     area = parse(input_data)
-    return Backtracking(area).fastest_route()
+    return Expedition(area).fastest_route()
 
 
 def part2(input_data: str):
     area = parse(input_data)
-    return Backtracking(area).fastest_route(stages=3)
+    return Expedition(area).fastest_route(stages=3)
 
 
 if __name__ == '__main__':
-    import sys
-
-    sys.setrecursionlimit(10000)
-
-    assert Backtracking(parse("""#.#####
+    assert Expedition(parse("""#.#####
 #.....#
 #>....#
 #.....#
@@ -232,12 +161,12 @@ if __name__ == '__main__':
 #.....#
 #.....#
 #####.#"""
-    assert Backtracking(parse(EXAMPLE))._areas[0].visualize() == Backtracking(parse(EXAMPLE)).areas(Backtracking(parse(EXAMPLE)).lcm).visualize()
+    assert Expedition(parse(EXAMPLE))._areas[0].visualize() == Expedition(parse(EXAMPLE)).areas(Expedition(parse(EXAMPLE)).lcm).visualize()
     with ContextTimer():
         assert part1(EXAMPLE) == 18
     with ContextTimer():
-        print(f'Solution for part 1 is: {part1(get_input())}')  # takes about 10 seconds
+        print(f'Solution for part 1 is: {part1(get_input())}')
     with ContextTimer():
         assert part2(EXAMPLE) == 54
     with ContextTimer():
-        print(f'Solution for part 2 is: {part2(get_input())}')  # takes about 40 seconds
+        print(f'Solution for part 2 is: {part2(get_input())}')
@@ -1,6 +1,6 @@
 import math
 
-from src.input_util import get_input
+from src.input_util import InputData, iter_lines, map_input
 
 EXAMPLE = """1=-0-2
 12111
@@ -53,11 +53,11 @@ def verify_table(table: str):
         assert snafu_to_int(snafu) == decimal
 
 
-def part1(input_data: str):
-    return int_to_snafu(sum(snafu_to_int(line) for line in input_data.split('\n')))
+def part1(input_data: InputData):
+    return int_to_snafu(sum(snafu_to_int(line) for line in iter_lines(input_data)))
 
 
-def part2(input_data: str):
+def part2(input_data: InputData):
     pass
 
 
@@ -97,6 +97,7 @@ if __name__ == '__main__':
     assert int_to_snafu(10) == '20'
     assert int_to_snafu(4890) == '2=-1=0'
     assert part1(EXAMPLE) == '2=-1=0'
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    assert part2(EXAMPLE) == None
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    with map_input() as input_data:
+        print(f'Solution for part 1 is: {part1(input_data)}')
+        assert part2(EXAMPLE) == None
+        print(f'Solution for part 2 is: {part2(input_data)}')
@@ -1,34 +1,104 @@
 import string
 
-from src.input_util import get_input
+import numpy as np
 
+from src.input_util import InputData, iter_lines, map_input
 
-def priority(char: str) -> int:
-    return string.ascii_letters.index(char) + 1
+# python: a line at a time, with sets of items
+# numpy: the whole input at once, with the items of every compartment as the bits of an int
+ENGINES = ('python', 'numpy')
 
+# The bit of every byte, 1 << priority for items and 0 for bytes that aren't items
+ITEM_BITS = np.zeros(256, dtype=np.uint64)
+ITEM_BITS[np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)] = (
+    np.uint64(1) << np.arange(1, len(string.ascii_letters) + 1, dtype=np.uint64)
+)
+PRIORITY = {char: priority for priority, char in enumerate(string.ascii_letters, start=1)}
 
-def part1(input_data: str):
-    score = 0
-    for line in input_data.split('\n'):
-        if line:
-            a, b = set(line[:len(line) // 2]), set(line[len(line) // 2:])
-            for c in a & b:
-                score += priority(c)
-    return score
 
+def priority(common: set[str]) -> int:
+    """The priority of the only item in the set"""
+    if len(common) != 1:
+        raise ValueError(f'Expected a single common item, got {common}')
+    return PRIORITY[next(iter(common))]
 
-def part2(input_data: str):
-    score = 0
-    lines = [line for line in input_data.split('\n') if line]
-    for group_index in range(0, len(lines), 3):
-        group = lines[group_index:group_index + 3]
-        common_item = set(group[0]) & set(group[1]) & set(group[2])
-        if len(common_item) != 1:
-            raise ValueError()
-        score += priority(list(common_item)[0])
-    return score
+
+def compartments(input_data: InputData) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For every rucksack, the items in its first and in its second compartment, as bitmasks.
+    The bits of the items are ORed together per half line in a single reduceat over the whole input.
+    """
+    data = np.frombuffer(input_data.encode('ascii') if isinstance(input_data, str) else input_data, dtype=np.uint8)
+    if not len(data) or data[-1] != ord('\n'):
+        data = np.append(data, np.uint8(ord('\n')))
+    newlines = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate(([0], newlines[:-1] + 1))
+    # Blank lines hold no rucksack
+    is_rucksack = newlines > line_starts
+    newlines, line_starts = newlines[is_rucksack], line_starts[is_rucksack]
+    lengths = newlines - line_starts
+    if (lengths < 2).any():
+        raise ValueError('Expected at least an item in both compartments')
+
+    # The second half runs up to the next rucksack, the newlines and blank lines in between have no bits
+    bounds = np.empty(2 * len(lengths), dtype=np.int64)
+    bounds[0::2] = line_starts
+    bounds[1::2] = line_starts + lengths // 2
+    if not len(bounds):
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+    halves = np.bitwise_or.reduceat(ITEM_BITS[data], bounds)
+    return halves[0::2], halves[1::2]
+
+
+def score(common: np.ndarray) -> int:
+    """The sum of the priorities of the common items, a single bit per mask"""
+    if (common == 0).any() or (common & (common - np.uint64(1))).any():
+        raise ValueError('Expected a single common item in every rucksack or group')
+    # A power of two is exact as a float, its exponent is the priority
+    return int((np.frexp(common.astype(np.float64))[1] - 1).sum())
+
+
+def part1(input_data: InputData, engine: str = 'python'):
+    match engine:
+        case 'python':
+            total = 0
+            for line in iter_lines(input_data):
+                if line:
+                    total += priority(set(line[:len(line) // 2]) & set(line[len(line) // 2:]))
+            return total
+        case 'numpy':
+            first, second = compartments(input_data)
+            return score(first & second)
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
+
+
+def part2(input_data: InputData, engine: str = 'python'):
+    match engine:
+        case 'python':
+            total = 0
+            group = []
+            for line in iter_lines(input_data):
+                if line:
+                    group.append(line)
+                if len(group) == 3:
+                    total += priority(set(group[0]) & set(group[1]) & set(group[2]))
+                    group.clear()
+            if group:
+                raise ValueError('Expected groups of three rucksacks')
+            return total
+        case 'numpy':
+            first, second = compartments(input_data)
+            rucksacks = first | second
+            if len(rucksacks) % 3:
+                raise ValueError('Expected groups of three rucksacks')
+            return score(np.bitwise_and.reduce(rucksacks.reshape(-1, 3), axis=1))
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
 
 
 if __name__ == '__main__':
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    with map_input() as input_data:
+        print(f'Solution for part 1 is: {part1(input_data)}')
+        print(f'Solution for part 2 is: {part2(input_data)}')
+        assert (part1(input_data, engine='numpy'), part2(input_data, engine='numpy')) == (part1(input_data), part2(input_data))
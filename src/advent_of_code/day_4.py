@@ -1,26 +1,65 @@
+import numpy as np
+
 from src.input_util import get_input
 
+# python: a pair at a time, as intervals
+# numpy: all pairs at once, as a matrix with a row of 4 section bounds per pair
+ENGINES = ('python', 'numpy')
+
+# First and last section, both included
+Interval = tuple[int, int]
+
+SEPARATORS = str.maketrans('-,', '  ')
 
-def parse_tasks(task: str) -> set:
+
+def parse_tasks(task: str) -> Interval:
     start, end = task.split('-')
-    return set(range(int(start), int(end) + 1))
+    return int(start), int(end)
 
 
-def parse_line(line: str) -> tuple[set, set]:
+def parse_line(line: str) -> tuple[Interval, Interval]:
     a, b = line.split(',')
     return parse_tasks(a), parse_tasks(b)
 
 
-def part1(input_data: str):
-    lines = [parse_line(line) for line in input_data.split('\n') if line]
-    return sum(a <= b or b <= a for a, b in lines)
+def parse_bounds(input_data: str) -> np.ndarray:
+    """The columns are the start and end of the first task, then the start and end of the second task"""
+    return np.array(input_data.translate(SEPARATORS).split(), dtype=np.int64).reshape(-1, 4)
+
+
+def contains(a: Interval, b: Interval) -> bool:
+    return a[0] <= b[0] and b[1] <= a[1]
+
+
+def overlaps(a: Interval, b: Interval) -> bool:
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+def part1(input_data: str, engine: str = 'python'):
+    match engine:
+        case 'python':
+            lines = [parse_line(line) for line in input_data.split('\n') if line]
+            return sum(contains(a, b) or contains(b, a) for a, b in lines)
+        case 'numpy':
+            start_a, end_a, start_b, end_b = parse_bounds(input_data).T
+            return int((((start_a <= start_b) & (end_b <= end_a)) | ((start_b <= start_a) & (end_a <= end_b))).sum())
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
 
 
-def part2(input_data: str):
-    lines = [parse_line(line) for line in input_data.split('\n') if line]
-    return sum(bool(a & b) for a, b in lines)
+def part2(input_data: str, engine: str = 'python'):
+    match engine:
+        case 'python':
+            lines = [parse_line(line) for line in input_data.split('\n') if line]
+            return sum(overlaps(a, b) for a, b in lines)
+        case 'numpy':
+            start_a, end_a, start_b, end_b = parse_bounds(input_data).T
+            return int(((start_a <= end_b) & (start_b <= end_a)).sum())
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
 
 
 if __name__ == '__main__':
     print(f'Solution for part 1 is: {part1(get_input())}')
     print(f'Solution for part 2 is: {part2(get_input())}')
+    assert (part1(get_input(), engine='numpy'), part2(get_input(), engine='numpy')) == (part1(get_input()), part2(get_input()))
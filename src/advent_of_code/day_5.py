@@ -1,69 +1,104 @@
-import dataclasses
-import re
+from array import array
 from collections import defaultdict
-from src.input_util import get_input
-
-
-@dataclasses.dataclass
-class Move:
-    number: int
-    source: int
-    destination: int
-
-
-def parse_input(input_data: str) -> tuple[dict[int, str], list[Move]]:
-    crates_str, moves_str = input_data.split('\n\n')
-
-    # parse crates
-    crates = defaultdict(str)
-    crates_str_list = crates_str.split('\n')
-    num_crates = max(int(i) for i in crates_str_list[-1].strip().split('   '))
-    for row in reversed(crates_str_list[:-1]):
-        for i in range(num_crates):
-            item_index = 1 + 4 * i
-            if item_index >= len(row):
-                continue
-            item = row[item_index]
-            if item != ' ':
-                crates[i + 1] += item
-
-    # parse moves
-    moves = []
-    for s in moves_str.split('\n'):
-        if s:
-            match = re.match('move (\d+) from (\d+) to (\d+)', s)
-            if not match:
-                pass
-            moves.append(Move(int(match.group(1)), int(match.group(2)), int(match.group(3))))
-
-    return crates, moves
-
-
-def execute_move_multiples(crates: dict[int, str], move):
-    crates[move.destination] += crates[move.source][-move.number:]
-    crates[move.source] = crates[move.source][:-move.number]
-
-
-def execute_move_one_by_one(crates: dict[int, str], move):
-    for _ in range(move.number):
-        crates[move.destination] += crates[move.source][-1]
-        crates[move.source] = crates[move.source][:-1]
-
-
-def part1(input_data: str):
-    crates, moves = parse_input(input_data)
-    for move in moves:
-        execute_move_one_by_one(crates, move)
-    return ''.join(crates[k][-1] for k in sorted(crates))
-
-
-def part2(input_data: str):
-    crates, moves = parse_input(input_data)
-    for move in moves:
-        execute_move_multiples(crates, move)
-    return ''.join(crates[k][-1] for k in sorted(crates))
+from typing import Iterator
+
+from tqdm import tqdm
+
+from src.input_util import InputData, map_input
+from src.timer_util import profiled, span
+
+# Characters of move lines to parse at a time
+CHUNK_SIZE = 2 ** 20
+
+
+@profiled()
+def parse_crates(crates_str: str) -> dict[int, str]:
+    """Every stack as the string of its crates, bottom first"""
+    lines = crates_str.split('\n')
+    num_crates = max(int(i) for i in lines[-1].split())
+    # The crates of a row are every 4th character, a stack is a column of rows
+    rows = [line[1::4].ljust(num_crates) for line in reversed(lines[:-1])]
+    return {i + 1: ''.join(column).rstrip(' ') for i, column in enumerate(zip(*rows))}
+
+
+def iter_moves(input_data: InputData, start: int, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, array]]:
+    """
+    The moves from `start` on, parsed a chunk of lines at a time, as the number of characters parsed with a flat array
+    of (number, source, destination) triples. Only a chunk of moves is in memory at a time, also when the input is the
+    memory-mapped input file.
+    """
+    newline, move = ('\n', 'move') if isinstance(input_data, str) else (b'\n', b'move')
+    while start < len(input_data):
+        stop = input_data.find(newline, start + chunk_size)
+        if stop == -1:
+            stop = len(input_data)
+        # Lines like 'move 1 from 2 to 3', the numbers are every other word. int() parses bytes as well
+        words = input_data[start:stop].split()
+        if len(words) % 6 or words[::6].count(move) != len(words) // 6:
+            raise ValueError('Expected lines like "move 1 from 2 to 3"')
+        yield stop + 1 - start, array('i', map(int, words[1::2]))
+        start = stop + 1
+
+
+def take_crates(crates: list[str], number: int) -> list[str]:
+    """Remove the top `number` crates of a stack, bottom first"""
+    if number > len(crates):
+        raise ValueError(f"Can't move {number} crates from a stack of {len(crates)}")
+    # crates[-0:] would be the whole stack
+    taken = crates[len(crates) - number:]
+    del crates[len(crates) - number:]
+    return taken
+
+
+def execute_move_multiples(stacks: dict[int, list[str]], number: int, source: int, destination: int):
+    stacks[destination].extend(take_crates(stacks[source], number))
+
+
+def execute_move_one_by_one(stacks: dict[int, list[str]], number: int, source: int, destination: int):
+    # Moving the crates one by one puts them on the destination in reverse order
+    stacks[destination].extend(reversed(take_crates(stacks[source], number)))
+
+
+def execute_moves(input_data: InputData, one_by_one: bool) -> str:
+    """
+    The crates on top of the stacks after all moves. The moves are executed as they are parsed.
+    Shows the progress for large inputs, as the characters parsed and the number of moves executed.
+    """
+    is_text = isinstance(input_data, str)
+    crates_end = input_data.find('\n\n' if is_text else b'\n\n')
+    if crates_end == -1:
+        raise ValueError('Expected the crates and the moves separated by a blank line')
+    crates_str = input_data[:crates_end]
+    crates = parse_crates(crates_str if is_text else crates_str.decode('ascii'))
+    moves_start = crates_end + 2
+    stacks = defaultdict(list, {i: list(stack) for i, stack in crates.items()})
+    execute_move = execute_move_one_by_one if one_by_one else execute_move_multiples
+
+    moves_count = 0
+    size = len(input_data) - moves_start
+    with (
+        span('execute moves'),
+        tqdm(total=size, unit='B', unit_scale=True, desc='Moves', disable=size < CHUNK_SIZE) as progress,
+    ):
+        for parsed, moves in iter_moves(input_data, moves_start):
+            triples = iter(moves)
+            for number, source, destination in zip(triples, triples, triples):
+                execute_move(stacks, number, source, destination)
+            moves_count += len(moves) // 3
+            progress.update(parsed)
+            progress.set_postfix(moves=moves_count, refresh=False)
+    return ''.join(stacks[k][-1] for k in sorted(stacks))
+
+
+def part1(input_data: InputData):
+    return execute_moves(input_data, True)
+
+
+def part2(input_data: InputData):
+    return execute_moves(input_data, False)
 
 
 if __name__ == '__main__':
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    with map_input() as input_data:
+        print(f'Solution for part 1 is: {part1(input_data)}')
+        print(f'Solution for part 2 is: {part2(input_data)}')
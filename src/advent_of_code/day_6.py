@@ -1,14 +1,76 @@
+import functools
+from typing import IO, Iterable, Iterator
+
 from src.input_util import get_input
 
+# Characters to read at a time from a file
+CHUNK_SIZE = 2 ** 16
+
+# The whole signal, an iterator of chunks of it, such as from a socket, or an open file that is read a chunk at a time
+Stream = str | bytes | bytearray | Iterable[str | bytes] | IO
+
+
+def iter_chunks(stream: Stream) -> Iterator[str | bytes]:
+    if isinstance(stream, (str, bytes, bytearray)):
+        yield stream
+    elif hasattr(stream, 'read'):
+        yield from iter(functools.partial(stream.read, CHUNK_SIZE), stream.read(0))
+    else:
+        yield from stream
+
+
+def find_markers(stream: Stream, sizes: Iterable[int]) -> dict[int, int]:
+    """
+    For every size, the number of characters up to and including the first `size` characters in a row that are all
+    different. A single pass that keeps the start of the current run of different characters, and where every character
+    was last seen: a repeated character moves the start to just past its last position.
+    The run grows by at most a character at a time, so the markers are found from the smallest size to the largest, and
+    the pass stops at the largest. Memory only depends on the alphabet.
+    """
+    pending = sorted(set(sizes))
+    if pending and pending[0] < 1:
+        raise ValueError(f'Marker sizes have to be positive, got {pending[0]}')
+    markers = {}
+    if not pending:
+        return markers
+    size = pending[0]
+    last_seen = {}
+    start = 0
+    position = 0
+    for chunk in iter_chunks(stream):
+        for char in chunk:
+            previous = last_seen.get(char, -1)
+            if previous >= start:
+                start = previous + 1
+            last_seen[char] = position
+            position += 1
+            if position - start == size:
+                markers[pending.pop(0)] = position
+                if not pending:
+                    return markers
+                size = pending[0]
+    raise ValueError(f'No marker of {size} different characters')
+
+
+def find_marker(stream: Stream, size: int) -> int:
+    return find_markers(stream, [size])[size]
+
+
+def solve(input_data: Stream) -> tuple[int, int]:
+    """Both parts in a single pass"""
+    markers = find_markers(input_data, [4, 14])
+    return markers[4], markers[14]
+
 
-def part1(input_data: str):
-    return 4 + next(i for i in range(len(input_data)) if len(set(input_data[i:i + 4])) == 4)
+def part1(input_data: Stream):
+    return find_marker(input_data, 4)
 
 
-def part2(input_data: str):
-    return 14 + next(i for i in range(len(input_data)) if len(set(input_data[i:i + 14])) == 14)
+def part2(input_data: Stream):
+    return find_marker(input_data, 14)
 
 
 if __name__ == '__main__':
-    print(f'Solution for part 1 is: {part1(get_input())}')
-    print(f'Solution for part 2 is: {part2(get_input())}')
+    solution_1, solution_2 = solve(get_input())
+    print(f'Solution for part 1 is: {solution_1}')
+    print(f'Solution for part 2 is: {solution_2}')
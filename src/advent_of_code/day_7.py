@@ -1,83 +1,130 @@
+import bisect
 import dataclasses
-from typing import Iterator
+import itertools
+from typing import Iterable, Iterator
 
-from src.input_util import get_input
+from src.input_util import InputData, Lines, get_input, iter_lines
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class File:
     name: str
     size: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Folder:
+    """size: of all files in the folder and its sub folders, once parsed"""
     name: str
-    parent: 'Folder'
+    parent: 'Folder | None'
     files: dict[str, File] = dataclasses.field(default_factory=dict)
     folders: dict[str, 'Folder'] = dataclasses.field(default_factory=dict)
     explored: bool = False
     size: int = 0
 
     def add_file(self, name: str, size: int):
-        self.files[name] = File(name, size)
-        self.size += size
-        p = self
-        while p := p.parent:
-            p.size += size
+        # Listing a folder again doesn't add its files again
+        if name not in self.files:
+            self.files[name] = File(name, size)
+            self.size += size
 
     def add_folder(self, name: str):
-        self.folders[name] = Folder(name, self)
+        if name not in self.folders:
+            self.folders[name] = Folder(name, self)
 
+    def size_index(self) -> 'SizeIndex':
+        """The index of the sizes of this folder and all folders below it"""
+        return SizeIndex(f.size for f in iterate_folders(self))
 
-def parse(input_data: str) -> Folder:
-    root = Folder('/', None)
-    head = root
 
-    lines = [l for l in input_data.split('\n') if l]
-    line_index = 1  # skipping the `cd /`
+class SizeIndex:
+    """
+    The sizes of a tree of folders, sorted, with their prefix sums. Built with a single walk of the tree, after which
+    every query is a bisect, so asking about other thresholds or disk sizes doesn't walk the tree again.
+    """
 
-    while line_index < len(lines):
-        match lines[line_index].split(' '):
-            case ['$', 'ls']:
-                head.explored = True
-                while line_index + 1 < len(lines) and lines[line_index + 1][0] != '$':
-                    line_index += 1
-                    match lines[line_index].split(' '):
-                        case ['dir', dir_name]:
-                            head.add_folder(dir_name)
-                        case [file_size, file_name]:
-                            head.add_file(file_name, int(file_size))
-                        case _:
-                            raise Exception()
+    def __init__(self, sizes: Iterable[int]):
+        self.sizes = sorted(sizes)
+        self._prefix_sums = list(itertools.accumulate(self.sizes, initial=0))
 
-            case ['$', 'cd', '..']:
-                head = head.parent
+    def __len__(self) -> int:
+        return len(self.sizes)
 
-            case ['$', 'cd', dir_name]:
-                head = head.folders[dir_name]
+    def smallest_at_least(self, size: int) -> int | None:
+        """The size of the smallest folder of at least `size`, None if there is none"""
+        i = bisect.bisect_left(self.sizes, size)
+        return self.sizes[i] if i < len(self.sizes) else None
 
-        line_index += 1
+    def sum_at_most(self, size: int) -> int:
+        """The sum of the sizes of all folders of at most `size`"""
+        return self._prefix_sums[bisect.bisect_right(self.sizes, size)]
 
+    def largest(self, k: int) -> list[int]:
+        """The sizes of the k largest folders, largest first"""
+        return self.sizes[:-k - 1:-1] if k > 0 else []
+
+
+def parse(input_data: InputData | Lines) -> Folder:
+    """
+    Builds the tree while streaming over the lines, so the log is never held in memory as a whole.
+    The folders from the root to the current folder are on a stack, with their size when they were entered. Leaving a
+    folder adds what it grew by since then to its parent, so every file is added once per level instead of to every
+    ancestor.
+    """
+    root = Folder('/', None)
+    path = [(root, 0)]
+
+    def leave():
+        folder, entered_size = path.pop()
+        folder.parent.size += folder.size - entered_size
+
+    lines = iter_lines(input_data) if isinstance(input_data, InputData) else input_data
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode()
+        match line.rstrip('\n').split(' '):
+            case ['$', 'ls']:
+                path[-1][0].explored = True
+            case ['$', 'cd', '/']:
+                while len(path) > 1:
+                    leave()
+            case ['$', 'cd', '..']:
+                leave()
+            case ['$', 'cd', dir_name]:
+                folder = path[-1][0].folders[dir_name]
+                path.append((folder, folder.size))
+            case ['dir', dir_name]:
+                path[-1][0].add_folder(dir_name)
+            case [file_size, file_name]:
+                path[-1][0].add_file(file_name, int(file_size))
+            case ['']:
+                pass
+            case _:
+                raise ValueError(f'Unexpected line: {line!r}')
+
+    while len(path) > 1:
+        leave()
     return root
 
 
 def iterate_folders(folder: Folder) -> Iterator[Folder]:
-    yield folder
-    for sub_folder in folder.folders.values():
-        yield from iterate_folders(sub_folder)
+    """The folder and all folders below it, depth first. Without recursion, so it handles trees of any depth."""
+    stack = [folder]
+    while stack:
+        folder = stack.pop()
+        yield folder
+        stack.extend(reversed(folder.folders.values()))
 
 
-def part1(input_data: str):
-    root = parse(input_data)
-    return sum(f.size for f in iterate_folders(root) if f.size <= 100000)
+def part1(input_data: InputData | Lines, max_size: int = 100000):
+    return parse(input_data).size_index().sum_at_most(max_size)
 
 
-def part2(input_data: str):
+def part2(input_data: InputData | Lines, disk_size: int = 70000000, needed_space: int = 30000000):
     root = parse(input_data)
-    current_free_space = 70000000 - root.size
-    additional_size_needed = 30000000 - current_free_space
-    return sorted([f for f in iterate_folders(root) if f.size >= additional_size_needed], key=lambda f: f.size)[0].size
+    current_free_space = disk_size - root.size
+    additional_size_needed = needed_space - current_free_space
+    return root.size_index().smallest_at_least(additional_size_needed)
 
 
 if __name__ == '__main__':
@@ -1,14 +1,61 @@
+import numpy as np
+
+from src.grid_util import Grid, shift
 from src.input_util import get_input
 
+DIGITS = {str(height): height for height in range(10)}
 
-def parse_rows(input_data: str) -> list[list[int]]:
-    rows = []
-    for row in [r for r in input_data.split('\n') if r]:
-        rows.append(list(map(int, row)))
-    return rows
+# Columns to look at a time when looking for visible trees
+BLOCK_SIZE = 64
+
+# numpy: all rows at once, a block of columns at a time, from each side
+# python: a tree at a time
+ENGINES = ('numpy', 'python')
 
 
-def part1(input_data: str):
+def parse_grid(input_data: str) -> Grid:
+    return Grid.parse(input_data.strip('\n'), DIGITS)
+
+
+def parse_rows(input_data: str) -> list[list[int]]:
+    return parse_grid(input_data).cells.tolist()
+
+
+def mark_visible_from_left(heights: np.ndarray, visible: np.ndarray, tallest: int):
+    """
+    Marks the trees that are higher than all trees to their left as visible. A block of columns at a time, with the
+    highest tree so far carried over between blocks. No tree is visible past a tree of the `tallest` height in the forest,
+    so it stops once every row has one, which on large forests is after the first few blocks.
+    """
+    # Lower than any tree, so the trees at the edge are visible
+    highest = np.full((heights.shape[0], 1), -1, dtype=np.int8)
+    for start in range(0, heights.shape[1], BLOCK_SIZE):
+        block = heights[:, start:start + BLOCK_SIZE].astype(np.int8)
+        running = np.maximum.accumulate(np.concatenate((highest, block), axis=1), axis=1)
+        visible[:, start:start + BLOCK_SIZE] |= block > running[:, :-1]
+        highest = running[:, -1:]
+        if highest.min() == tallest:
+            break
+
+
+def part1(input_data: str, engine: str = 'numpy'):
+    match engine:
+        case 'numpy':
+            heights = parse_grid(input_data).cells
+            visible = np.zeros(heights.shape, dtype=bool)
+            tallest = int(heights.max())
+            # Looking from the right, top and bottom is looking from the left at flipped and transposed views
+            for view in (np.s_[:, :], np.s_[:, ::-1]):
+                mark_visible_from_left(heights[view], visible[view], tallest)
+                mark_visible_from_left(heights.T[view], visible.T[view], tallest)
+            return int(np.count_nonzero(visible))
+        case 'python':
+            return part1_python(input_data)
+        case _:
+            raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
+
+
+def part1_python(input_data: str):
     heights: list[list[int]] = parse_rows(input_data)
     visible: list[list[bool]] = [[False] * len(heights[0]) for _ in range(len(heights))]
 
@@ -49,91 +96,30 @@ def part1(input_data: str):
     return sum(t for row in visible for t in row)
 
 
-def part2(input_data: str):
-    heights: list[list[int]] = parse_rows(input_data)
-    scores: list[list[int]] = [[1] * len(heights[0]) for _ in range(len(heights))]
+def viewing_distances_left(heights: np.ndarray) -> np.ndarray:
+    """For every tree, the number of trees it sees to its left: up to and including the first one that is at least as high."""
+    columns = np.arange(heights.shape[1])
+    distances = np.zeros(heights.shape, dtype=np.int64)
+    for height in range(10):
+        # Column of the last tree to the left that is at least this high, 0 when there is none and the view reaches the edge
+        last_blocking = shift(np.maximum.accumulate(np.where(heights >= height, columns, 0), axis=1), (0, -1))
+        is_height = heights == height
+        distances[is_height] = (columns - last_blocking)[is_height]
+    return distances
 
-    # Left to right
-    for i, row in enumerate(heights):
-        height_to_most_recent_index = {h: None for h in range(10)}
-        for j, height in enumerate(row):
-            if all(index is None for index in height_to_most_recent_index.values()):
-                # Near the edge
-                scores[i][j] *= 0
-            elif tree_indices_with_greater_or_equal_height := [
-                index
-                for other_height, index in height_to_most_recent_index.items()
-                if index is not None and other_height >= height
-            ]:
-                # The view is blocked by another tree
-                scores[i][j] *= j - max(tree_indices_with_greater_or_equal_height)
-            else:
-                # Can see from the start
-                scores[i][j] *= j
-            height_to_most_recent_index[heights[i][j]] = j
 
-    # Right to left
-    for i, row in enumerate(heights):
-        height_to_most_recent_index = {h: None for h in range(10)}
-        for j, height in reversed(list(enumerate(row))):
-            if all(index is None for index in height_to_most_recent_index.values()):
-                # Near the edge
-                scores[i][j] *= 0
-            elif tree_indices_with_greater_or_equal_height := [
-                index
-                for other_height, index in height_to_most_recent_index.items()
-                if index is not None and other_height >= height
-            ]:
-                # The view is blocked by another tree
-                scores[i][j] *= min(tree_indices_with_greater_or_equal_height) - j
-            else:
-                # Can see from the start
-                scores[i][j] *= len(heights[0]) - j - 1
-            height_to_most_recent_index[heights[i][j]] = j
-
-    # Up to down
-    for j in range(len(heights[0])):
-        height_to_most_recent_index = {h: None for h in range(10)}
-        for i, row in enumerate(heights):
-            height = heights[i][j]
-            if all(index is None for index in height_to_most_recent_index.values()):
-                # Near the edge
-                scores[i][j] *= 0
-            elif tree_indices_with_greater_or_equal_height := [
-                index
-                for other_height, index in height_to_most_recent_index.items()
-                if index is not None and other_height >= height
-            ]:
-                # The view is blocked by another tree
-                scores[i][j] *= i - max(tree_indices_with_greater_or_equal_height)
-            else:
-                # Can see from the start
-                scores[i][j] *= i
-            height_to_most_recent_index[heights[i][j]] = i
-
-    # Down to up
-    for j in range(len(heights[0])):
-        height_to_most_recent_index = {h: None for h in range(10)}
-        for i, row in reversed(list(enumerate(heights))):
-            height = heights[i][j]
-            if all(index is None for index in height_to_most_recent_index.values()):
-                # Near the edge
-                scores[i][j] *= 0
-            elif tree_indices_with_greater_or_equal_height := [
-                index
-                for other_height, index in height_to_most_recent_index.items()
-                if index is not None and other_height >= height
-            ]:
-                # The view is blocked by another tree
-                scores[i][j] *= min(tree_indices_with_greater_or_equal_height) - i
-            else:
-                # Can see from the start
-                scores[i][j] *= len(heights) - i - 1
-            height_to_most_recent_index[heights[i][j]] = i
-
-    return max(t for row in scores for t in row)
+def part2(input_data: str):
+    heights = parse_grid(input_data).cells
+    scores = (
+        viewing_distances_left(heights)
+        * viewing_distances_left(heights[:, ::-1])[:, ::-1]
+        * viewing_distances_left(heights.T).T
+        * viewing_distances_left(heights.T[:, ::-1])[:, ::-1].T
+    )
+    return int(scores.max())
 
 
 if __name__ == '__main__':
     print(f'Solution for part 1 is: {part1(get_input())}')
     print(f'Solution for part 2 is: {part2(get_input())}')
+    assert part1(get_input(), engine='python') == part1(get_input())
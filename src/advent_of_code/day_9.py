@@ -1,5 +1,4 @@
-from enum import Enum
-
+from src.direction_util import BY_LETTER, DELTAS
 from src.input_util import get_input
 
 EXAMPLE_PART_1 = """R 4
@@ -21,62 +20,30 @@ L 25
 U 20"""
 
 
-class Direction(Enum):
-    UP = 'U'
-    DOWN = 'D'
-    LEFT = 'L'
-    RIGHT = 'R'
-
-
 Position = tuple[int, int]
 
 
-def move(head: Position, direction: Direction) -> Position:
-    match direction:
-        case Direction.UP:
-            return head[0] + 1, head[1]
-        case Direction.DOWN:
-            return head[0] - 1, head[1]
-        case Direction.LEFT:
-            return head[0], head[1] - 1
-        case Direction.RIGHT:
-            return head[0], head[1] + 1
-        case _:
-            raise ValueError()
+def move(head: Position, delta: tuple[int, int]) -> Position:
+    return head[0] + delta[0], head[1] + delta[1]
 
 
 def update_tail(head: Position, tail: Position) -> Position:
-    if abs(head[0] - tail[0]) < 2 and abs(head[1] - tail[1]) < 2:
+    dx, dy = head[0] - tail[0], head[1] - tail[1]
+    if -1 <= dx <= 1 and -1 <= dy <= 1:
         # No need to move
         return tail
-    for direction in Direction:
-        # Head is on the same line, 2 tiles away
-        if move(move(tail, direction), direction) == head:
-            return move(tail, direction)
-    if head[0] > tail[0] and head[1] > tail[1]:
-        # Head is upper right
-        return tail[0] + 1, tail[1] + 1
-    elif head[0] > tail[0] and head[1] < tail[1]:
-        # Head is lower right
-        return tail[0] + 1, tail[1] - 1
-    elif head[0] < tail[0] and head[1] > tail[1]:
-        # Head is upper left
-        return tail[0] - 1, tail[1] + 1
-    elif head[0] < tail[0] and head[1] < tail[1]:
-        # Head is lower left
-        return tail[0] - 1, tail[1] - 1
-    else:
-        raise Exception()
-
-
-def execute_move_simple(head: Position, tail: Position, direction: Direction) -> tuple[Position, Position]:
-    head = move(head, direction)
+    # Step towards the head: straight when on the same line, diagonally otherwise
+    return tail[0] + (dx > 0) - (dx < 0), tail[1] + (dy > 0) - (dy < 0)
+
+
+def execute_move_simple(head: Position, tail: Position, delta: tuple[int, int]) -> tuple[Position, Position]:
+    head = move(head, delta)
     tail = update_tail(head, tail)
     return head, tail
 
 
-def execute_move_long_rope(knots: list[Position], direction: Direction) -> list[Position]:
-    knots[0] = move(knots[0], direction)
+def execute_move_long_rope(knots: list[Position], delta: tuple[int, int]) -> list[Position]:
+    knots[0] = move(knots[0], delta)
     for i in range(1, len(knots)):
         knots[i] = update_tail(knots[i - 1], knots[i])
     return knots
@@ -86,8 +53,9 @@ def part1(input_data: str):
     head, tail = (0, 0), (0, 0)
     visited_positions = {tail}
     for direction_str, times_str in [line.split(' ') for line in input_data.split('\n') if line]:
+        delta = DELTAS[BY_LETTER[direction_str]]
         for _ in range(int(times_str)):
-            head, tail = execute_move_simple(head, tail, Direction(direction_str))
+            head, tail = execute_move_simple(head, tail, delta)
             visited_positions.add(tail)
     return len(visited_positions)
 
@@ -96,8 +64,9 @@ def part2(input_data: str):
     knots = [(0, 0)] * 10
     visited_positions = {knots[-1]}
     for direction_str, times_str in [line.split(' ') for line in input_data.split('\n') if line]:
+        delta = DELTAS[BY_LETTER[direction_str]]
         for _ in range(int(times_str)):
-            knots = execute_move_long_rope(knots, Direction(direction_str))
+            knots = execute_move_long_rope(knots, delta)
             visited_positions.add(knots[-1])
     return len(visited_positions)
 
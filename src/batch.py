@@ -0,0 +1,84 @@
+"""
+Solve a part of a day for many inputs at once, spread over all cores.
+
+Usage: python -m src.batch DAY PART FILE [FILE ...] [--workers N] [--no-cache] [--json]
+
+Every worker imports the day once, so the regexes, lookup tables and other module level precomputation are shared by
+all inputs it solves. Results are in the order of the inputs and have their own timings.
+"""
+import argparse
+import dataclasses
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.run import PartResult, RunOptions, load_day, solve_part
+
+
+def _solve(day: int, part: int, options: RunOptions, kwargs: dict[str, Any], input_data: str) -> PartResult:
+    return solve_part(day, part, options, input_data, kwargs)
+
+
+def solve_batch(
+        day: int,
+        part: int,
+        inputs: Iterable[str],
+        workers: int | None = None,
+        options: RunOptions = RunOptions(),
+        **kwargs,
+) -> list[PartResult]:
+    """
+    Solve the part for every input, in parallel. The keyword arguments are passed on to every solve.
+    Exceptions end up in the results, so a bad input doesn't stop the batch.
+    """
+    inputs = [input_data.strip('\n') for input_data in inputs]
+    if not inputs:
+        return []
+    workers = min(workers or os.cpu_count(), len(inputs))
+    # Several inputs per task keeps the overhead of the pool low, while still balancing the load over the workers
+    chunk_size = max(1, len(inputs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_day, initargs=(day,)) as executor:
+        return list(executor.map(functools.partial(_solve, day, part, options, kwargs), inputs, chunksize=chunk_size))
+
+
+def format_results(names: list[str], results: list[PartResult], total_wall_time: float) -> str:
+    width = max(len(name) for name in names)
+    header = f'{"input":<{width}} {"wall (s)":>9}  answer'
+    lines = [header, '-' * len(header)]
+    for name, result in zip(names, results):
+        lines.append(f'{name:<{width}} {result.wall_time:>9.04f}  {result.error or result.answer}')
+    lines.append('-' * len(header))
+    solved = sum(not r.error for r in results)
+    lines.append(f'{solved}/{len(results)} solved in {total_wall_time:.02f}s, {len(results) / total_wall_time:.01f} inputs/s')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve a part for many inputs in parallel.')
+    parser.add_argument('day', type=int)
+    parser.add_argument('part', type=int)
+    parser.add_argument('files', nargs='+', type=Path, help='input files')
+    parser.add_argument('--workers', type=int, default=None, help='size of the process pool, defaults to the number of CPUs')
+    parser.add_argument('--no-cache', action='store_true', help='solve every input again, even when its answer is cached')
+    parser.add_argument('--json', action='store_true', help='print a JSON line per input instead of a table')
+    args = parser.parse_args()
+
+    names = [str(file) for file in args.files]
+    start = time.perf_counter()
+    results = solve_batch(args.day, args.part, (file.read_text() for file in args.files), args.workers, RunOptions(use_cache=not args.no_cache))
+    if args.json:
+        for name, result in zip(names, results):
+            print(json.dumps({'input': name} | dataclasses.asdict(result), default=str))
+    else:
+        print(format_results(names, results, time.perf_counter() - start))
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Benchmark the parts of the days on generated inputs of increasing size.
+
+Usage: python -m src.benchmark [days ...] [--scales 1 10 100 1000] [--repeat 3] [--seed 2022] [--timeout 60]
+"""
+import argparse
+
+from src.benchmark.generators import GENERATORS
+from src.benchmark.measure import benchmark, format_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parts of the days on generated inputs of increasing size.')
+    parser.add_argument('days', nargs='*', type=int, help='days to benchmark, defaults to all days')
+    parser.add_argument('--scales', nargs='+', type=float, default=[1, 10, 100, 1000], help='input sizes, relative to the official input')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per part and scale, the median is reported')
+    parser.add_argument('--seed', type=int, default=2022, help='seed for the input generators')
+    parser.add_argument('--timeout', type=float, default=60, help='seconds before giving up on a part at a scale, larger scales are skipped')
+    args = parser.parse_args()
+
+    measurements = benchmark(args.days or sorted(GENERATORS), args.scales, args.seed, args.repeat, args.timeout)
+    print(format_report(measurements))
+
+
+if __name__ == '__main__':
+    main()
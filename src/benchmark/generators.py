@@ -0,0 +1,478 @@
+"""
+Seeded generators of synthetic puzzle inputs.
+
+Every generator takes a `random.Random` and a scale, and returns a `Workload` whose input is about `scale` times the size of the
+official input. Grid days scale the area rather than a single side. Some days need extra arguments for their parts when the input
+does not have the official dimensions, e.g. the row to check on day 15 or the cube face size on day 22.
+"""
+import dataclasses
+import itertools
+import math
+import random
+import string
+from typing import Callable
+
+
+@dataclasses.dataclass
+class Workload:
+    input_data: str
+    part_args: dict[int, tuple] = dataclasses.field(default_factory=dict)
+
+    def args(self, part: int) -> tuple:
+        return self.part_args.get(part, ())
+
+
+Generator = Callable[[random.Random, float], Workload]
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    def register(f: Generator) -> Generator:
+        GENERATORS[day] = f
+        return f
+
+    return register
+
+
+def generate(day: int, scale: float = 1, seed: int = 2022) -> Workload:
+    return GENERATORS[day](random.Random(f'{day}-{seed}'), scale)
+
+
+def scaled(n: int, scale: float) -> int:
+    """Scale a count"""
+    return max(1, round(n * scale))
+
+
+def scaled_side(n: int, scale: float, dimensions: int = 2) -> int:
+    """Scale the side of a square or cube, so that the area or volume scales"""
+    return max(1, round(n * scale ** (1 / dimensions)))
+
+
+@generator(1)
+def day_1(rng: random.Random, scale: float) -> Workload:
+    elves = [
+        '\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(scaled(250, scale))
+    ]
+    return Workload('\n\n'.join(elves))
+
+
+@generator(2)
+def day_2(rng: random.Random, scale: float) -> Workload:
+    rounds = [f'{rng.choice("ABC")} {rng.choice("XYZ")}' for _ in range(scaled(2500, scale))]
+    return Workload('\n'.join(rounds))
+
+
+@generator(3)
+def day_3(rng: random.Random, scale: float) -> Workload:
+    lines = []
+    for _ in range(scaled(100, scale)):
+        # Every elf of the group draws from its own pool of items, so only the badge is common
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, pools = letters[0], [letters[1 + 17 * i:18 + 17 * i] for i in range(3)]
+        for pool in pools:
+            # Both compartments draw from a different half of the pool, so only `shared` is in both
+            left_pool, right_pool = pool[:8], pool[8:]
+            shared = rng.choice(left_pool + [badge])
+            half = rng.randint(8, 24)
+            left = [shared, badge] + rng.choices(left_pool, k=half - 2)
+            right = [shared] + rng.choices(right_pool, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append(''.join(left + right))
+    return Workload('\n'.join(lines))
+
+
+@generator(4)
+def day_4(rng: random.Random, scale: float) -> Workload:
+    def section() -> str:
+        start = rng.randint(1, 99)
+        return f'{start}-{rng.randint(start, 99)}'
+
+    return Workload('\n'.join(f'{section()},{section()}' for _ in range(scaled(1000, scale))))
+
+
+@generator(5)
+def day_5(rng: random.Random, scale: float) -> Workload:
+    number_of_stacks = 9
+    heights = [rng.randint(2, max(2, scaled(8, scale))) for _ in range(number_of_stacks)]
+    stacks = [rng.choices(string.ascii_uppercase, k=height) for height in heights]
+    rows = [
+        ' '.join(f'[{stack[level]}]' if level < len(stack) else '   ' for stack in stacks).rstrip()
+        for level in reversed(range(max(heights)))
+    ]
+    rows.append(' ' + '   '.join(str(i + 1) for i in range(number_of_stacks)) + ' ')
+
+    # Never empty a stack, the answer reads the top of every stack
+    moves = []
+    for _ in range(scaled(500, scale)):
+        source = rng.choice([i for i, height in enumerate(heights) if height > 1])
+        destination = rng.choice([i for i in range(number_of_stacks) if i != source])
+        number = rng.randint(1, min(heights[source] - 1, 30))
+        heights[source] -= number
+        heights[destination] += number
+        moves.append(f'move {number} from {source + 1} to {destination + 1}')
+
+    return Workload('\n'.join(rows) + '\n\n' + '\n'.join(moves))
+
+
+@generator(6)
+def day_6(rng: random.Random, scale: float) -> Workload:
+    # Only 3 distinct characters up until the very end, so both parts have to scan the whole buffer
+    size = scaled(4096, scale)
+    return Workload(''.join(rng.choices('xyz', k=max(0, size - 14))) + 'abcdefghijklmn')
+
+
+@generator(7)
+def day_7(rng: random.Random, scale: float) -> Workload:
+    number_of_folders, number_of_files = scaled(180, scale), scaled(700, scale)
+    total_size = 45_000_000
+
+    def unique_name(taken: set[str], extension: str = '') -> str:
+        while (name := ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) + extension) in taken:
+            pass
+        taken.add(name)
+        return name
+
+    # Folder 0 is the root, every other folder picks a random existing parent
+    names: list[set[str]] = [set()]
+    sub_folders: list[list[tuple[str, int]]] = [[]]
+    files: list[list[str]] = [[]]
+    for index in range(1, number_of_folders):
+        parent = rng.randrange(index)
+        sub_folders[parent].append((unique_name(names[parent]), index))
+        names.append(set())
+        sub_folders.append([])
+        files.append([])
+    for _ in range(number_of_files):
+        folder = rng.randrange(number_of_folders)
+        size = rng.randint(1000, 2 * total_size // number_of_files)
+        files[folder].append(f'{size} {unique_name(names[folder], rng.choice(["", ".txt", ".dat", ".log"]))}')
+
+    lines = ['$ cd /']
+    to_visit: list[tuple[str, int] | None] = [('/', 0)]
+    while to_visit:
+        if (current := to_visit.pop()) is None:
+            lines.append('$ cd ..')
+            continue
+        name, index = current
+        if index:
+            lines.append(f'$ cd {name}')
+        lines.append('$ ls')
+        lines += [f'dir {sub_name}' for sub_name, _ in sub_folders[index]] + files[index]
+        for sub_folder in reversed(sub_folders[index]):
+            to_visit += [None, sub_folder]
+
+    return Workload('\n'.join(lines))
+
+
+@generator(8)
+def day_8(rng: random.Random, scale: float) -> Workload:
+    side = scaled_side(99, scale)
+    return Workload('\n'.join(''.join(rng.choices(string.digits, k=side)) for _ in range(side)))
+
+
+@generator(9)
+def day_9(rng: random.Random, scale: float) -> Workload:
+    return Workload('\n'.join(f'{rng.choice("UDLR")} {rng.randint(1, 19)}' for _ in range(scaled(2000, scale))))
+
+
+@generator(10)
+def day_10(rng: random.Random, scale: float) -> Workload:
+    lines, x = [], 1
+    for _ in range(scaled(142, scale)):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            # Keep the sprite around the screen
+            value = rng.randint(max(-10, -5 - x), min(10, 45 - x))
+            x += value
+            lines.append(f'addx {value}')
+    return Workload('\n'.join(lines))
+
+
+@generator(11)
+def day_11(rng: random.Random, scale: float) -> Workload:
+    number_of_monkeys = 8
+    tests = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], number_of_monkeys)
+    # Like the official input, a single monkey squares the worry level
+    operations = ['old * old'] + [
+        rng.choice([f'old * {rng.randint(2, 19)}', f'old + {rng.randint(1, 8)}'])
+        for _ in range(number_of_monkeys - 1)
+    ]
+    rng.shuffle(operations)
+
+    monkeys = []
+    for i in range(number_of_monkeys):
+        items = [str(rng.randint(50, 99)) for _ in range(scaled(rng.randint(1, 8), scale))]
+        target_true, target_false = rng.sample([j for j in range(number_of_monkeys) if j != i], 2)
+        monkeys.append('\n'.join([
+            f'Monkey {i}:',
+            f'  Starting items: {", ".join(items)}',
+            f'  Operation: new = {operations[i]}',
+            f'  Test: divisible by {tests[i]}',
+            f'    If true: throw to monkey {target_true}',
+            f'    If false: throw to monkey {target_false}',
+        ]))
+    return Workload('\n\n'.join(monkeys))
+
+
+@generator(12)
+def day_12(rng: random.Random, scale: float) -> Workload:
+    # The base height climbs at most one per column. The middle row has no noise, so there is always a path from S to E
+    rows, columns = scaled_side(41, scale), max(26, scaled_side(180, scale))
+    middle = rows // 2
+    lines = []
+    for i in range(rows):
+        row = []
+        for j in range(columns):
+            noise = 0 if i == middle else rng.choice([0, 0, 1, 2, 3])
+            row.append(string.ascii_lowercase[max(0, j * 25 // (columns - 1) - noise)])
+        lines.append(row)
+    lines[middle][0], lines[middle][-1] = 'S', 'E'
+    return Workload('\n'.join(''.join(row) for row in lines))
+
+
+@generator(13)
+def day_13(rng: random.Random, scale: float) -> Workload:
+    def packet(depth: int = 0) -> list:
+        return [
+            packet(depth + 1) if depth < 4 and rng.random() < 0.3 else rng.randint(0, 10)
+            for _ in range(rng.randint(0, 5))
+        ]
+
+    def packet_str() -> str:
+        return str(packet()).replace(' ', '')
+
+    return Workload('\n\n'.join(f'{packet_str()}\n{packet_str()}' for _ in range(scaled(150, scale))))
+
+
+@generator(14)
+def day_14(rng: random.Random, scale: float) -> Workload:
+    max_y = scaled_side(170, scale)
+    lines = []
+    for _ in range(scaled(160, scale)):
+        # Stay clear of the source at 500,0
+        x, y = rng.randint(500 - max_y // 2, 500 + max_y // 2), rng.randint(10, max_y)
+        path = [(x, y)]
+        for step in range(rng.randint(1, 8)):
+            length = rng.randint(1, 8) * rng.choice([-1, 1])
+            if step % 2:
+                y = min(max_y, max(10, y + length))
+            else:
+                x += length
+            path.append((x, y))
+        lines.append(' -> '.join(f'{x},{y}' for x, y in path))
+    return Workload('\n'.join(lines))
+
+
+@generator(15)
+def day_15(rng: random.Random, scale: float) -> Workload:
+    """
+    Every sensor's range stops right before the hidden beacon. Sensors in the 4 corners make sure it's the only free spot:
+    e.g. the sensor in the bottom right corner covers every other position to the bottom right of the hidden beacon.
+    """
+    max_co = 4_000_000
+    hidden_x, hidden_y = rng.randint(1, max_co - 1), rng.randint(1, max_co - 1)
+    sensors = [(0, 0), (max_co, 0), (0, max_co), (max_co, max_co)]
+    while len(sensors) < max(4, scaled(32, scale)):
+        x, y = rng.randint(0, max_co), rng.randint(0, max_co)
+        if abs(x - hidden_x) + abs(y - hidden_y) >= 2:
+            sensors.append((x, y))
+    rng.shuffle(sensors)
+
+    lines = []
+    for x, y in sensors:
+        distance = abs(x - hidden_x) + abs(y - hidden_y) - 1
+        dx = rng.randint(-distance, distance)
+        dy = (distance - abs(dx)) * rng.choice([-1, 1])
+        lines.append(f'Sensor at x={x}, y={y}: closest beacon is at x={x + dx}, y={y + dy}')
+    return Workload('\n'.join(lines), {1: (max_co // 2,), 2: (max_co,)})
+
+
+@generator(16)
+def day_16(rng: random.Random, scale: float) -> Workload:
+    number_of_valves = scaled(62, scale)
+    name_length = 2 if number_of_valves <= 26 ** 2 else 3
+    all_names = [''.join(t) for t in itertools.product(string.ascii_uppercase, repeat=name_length) if ''.join(t) != 'AA']
+    names = ['AA'] + rng.sample(all_names, number_of_valves - 1)
+
+    # A random tree, plus some extra tunnels
+    tunnels: list[set[int]] = [set() for _ in names]
+    for i in range(1, number_of_valves):
+        j = rng.randrange(i)
+        tunnels[i].add(j)
+        tunnels[j].add(i)
+    for _ in range(number_of_valves // 4):
+        i, j = rng.sample(range(number_of_valves), 2) if number_of_valves > 1 else (0, 0)
+        if i != j:
+            tunnels[i].add(j)
+            tunnels[j].add(i)
+
+    lines = []
+    for i, name in enumerate(names):
+        rate = 0 if i == 0 or rng.random() > 15 / 62 else rng.randint(3, 25)
+        neighbours = [names[j] for j in tunnels[i]]
+        if len(neighbours) == 1:
+            lines.append(f'Valve {name} has flow rate={rate}; tunnel leads to valve {neighbours[0]}')
+        else:
+            lines.append(f'Valve {name} has flow rate={rate}; tunnels lead to valves {", ".join(neighbours)}')
+    return Workload('\n'.join(lines))
+
+
+@generator(17)
+def day_17(rng: random.Random, scale: float) -> Workload:
+    return Workload(''.join(rng.choices('<>', k=scaled(10091, scale))))
+
+
+@generator(18)
+def day_18(rng: random.Random, scale: float) -> Workload:
+    # Random cubes in a ball, which leaves some pockets of air on the inside
+    number_of_cubes = scaled(2025, scale)
+    side = max(4, scaled_side(20, scale * 2, dimensions=3))
+    center, radius = side / 2, side / 2
+    cubes = set()
+    while len(cubes) < number_of_cubes:
+        cube = rng.randint(0, side), rng.randint(0, side), rng.randint(0, side)
+        if math.dist(cube, (center, center, center)) <= radius:
+            cubes.add(cube)
+    return Workload('\n'.join(f'{x},{y},{z}' for x, y, z in cubes))
+
+
+@generator(19)
+def day_19(rng: random.Random, scale: float) -> Workload:
+    lines = [
+        f'Blueprint {i}: '
+        f'Each ore robot costs {rng.randint(2, 4)} ore. '
+        f'Each clay robot costs {rng.randint(2, 4)} ore. '
+        f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+        f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(7, 20)} obsidian.'
+        for i in range(1, max(3, scaled(30, scale)) + 1)
+    ]
+    return Workload('\n'.join(lines))
+
+
+@generator(20)
+def day_20(rng: random.Random, scale: float) -> Workload:
+    values = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(scaled(5000, scale) - 1)]
+    values.insert(rng.randrange(len(values) + 1), 0)
+    return Workload('\n'.join(map(str, values)))
+
+
+@generator(21)
+def day_21(rng: random.Random, scale: float) -> Workload:
+    """
+    Built top down: every monkey gets the value it has to yell, and picks an operation and the values of its 2 children that
+    produce it. All divisions are exact when humn yells the answer of part 2.
+    humn is never a divisor, so part 1 never divides by 0.
+    """
+    number_of_leaves = scaled(1143, scale)
+    name_length = 4 if number_of_leaves < 50_000 else 6
+    names = {'root', 'humn'}
+
+    def new_name() -> str:
+        while (name := ''.join(rng.choices(string.ascii_lowercase, k=name_length))) in names:
+            pass
+        names.add(name)
+        return name
+
+    def children_values(value: int, humn_on_left: bool | None) -> tuple[str, int, int]:
+        options = ['-', '/']
+        if value >= 2:
+            options.append('+')
+        if divisors := [d for d in range(2, 13) if value % d == 0]:
+            options.append('*')
+        if humn_on_left is False:
+            options.remove('/')
+        match rng.choice(options):
+            case '+':
+                a = rng.randint(1, value - 1)
+                return '+', a, value - a
+            case '-':
+                b = rng.randint(1, 100)
+                return '-', value + b, b
+            case '*':
+                d = rng.choice(divisors)
+                return '*', value // d, d
+            case '/':
+                b = rng.randint(2, 12)
+                return '/', value * b, b
+
+    lines = []
+    target = rng.randint(10 ** 9, 10 ** 12)
+    left_leaves = rng.randint(1, number_of_leaves - 1) if number_of_leaves > 1 else 1
+    left, right = 'humn' if left_leaves == 1 else new_name(), new_name()
+    lines.append(f'root: {left} + {right}')
+    # name, value, number of leaves, whether humn is one of the leaves
+    to_build: list[tuple[str, int, int, bool]] = [(left, target, left_leaves, True), (right, target, max(1, number_of_leaves - left_leaves), False)]
+    while to_build:
+        name, value, leaves, has_humn = to_build.pop()
+        if leaves == 1:
+            lines.append(f'humn: {rng.randint(1, 5000)}' if has_humn else f'{name}: {value}')
+            continue
+        humn_on_left = rng.choice([True, False]) if has_humn else None
+        operation, a, b = children_values(value, humn_on_left)
+        a_leaves, b_leaves = (a_leaves := rng.randint(1, leaves - 1)), leaves - a_leaves
+        a_name = 'humn' if humn_on_left is True and a_leaves == 1 else new_name()
+        b_name = 'humn' if humn_on_left is False and b_leaves == 1 else new_name()
+        lines.append(f'{name}: {a_name} {operation} {b_name}')
+        to_build.append((a_name, a, a_leaves, humn_on_left is True))
+        to_build.append((b_name, b, b_leaves, humn_on_left is False))
+    rng.shuffle(lines)
+    return Workload('\n'.join(lines))
+
+
+@generator(22)
+def day_22(rng: random.Random, scale: float) -> Workload:
+    # Same cube layout as the official input, which matches `day_22.MAPPING_INPUT`
+    face_size = scaled_side(50, scale)
+    layout = ['.##', '.#.', '##.', '#..']
+    lines = []
+    for face_row in layout:
+        for _ in range(face_size):
+            row = ''
+            for face in face_row.rstrip('.'):
+                if face == '.':
+                    row += ' ' * face_size
+                else:
+                    row += ''.join(rng.choices('.#', weights=[9, 1], k=face_size))
+            lines.append(row)
+    # The start is the left most tile of the first row
+    lines[0] = lines[0][:face_size] + '.' + lines[0][face_size + 1:]
+
+    path = str(rng.randint(1, 50)) + ''.join(f'{rng.choice("LR")}{rng.randint(1, 50)}' for _ in range(scaled(2000, scale)))
+    return Workload('\n'.join(lines) + '\n\n' + path, {2: (face_size,)})
+
+
+@generator(23)
+def day_23(rng: random.Random, scale: float) -> Workload:
+    side = scaled_side(72, scale)
+    return Workload('\n'.join(''.join(rng.choices('#.', k=side)) for _ in range(side)))
+
+
+@generator(24)
+def day_24(rng: random.Random, scale: float) -> Workload:
+    # The width is a multiple of the height, which keeps the number of distinct valley states at `width`
+    height = scaled_side(35, scale)
+    width = 3 * height
+    lines = ['#.' + '#' * width]
+    for _ in range(height):
+        row = ''
+        for j in range(width):
+            if rng.random() > 0.9:
+                row += '.'
+            elif j in (0, width - 1):
+                # Like the official input, no vertical blizzards in the columns of the entrance and the exit
+                row += rng.choice('<>')
+            else:
+                row += rng.choice('<>^v')
+        lines.append(f'#{row}#')
+    lines.append('#' * width + '.#')
+    return Workload('\n'.join(lines))
+
+
+@generator(25)
+def day_25(rng: random.Random, scale: float) -> Workload:
+    numbers = [rng.choice('12') + ''.join(rng.choices('=-012', k=rng.randint(0, 19))) for _ in range(scaled(110, scale))]
+    return Workload('\n'.join(numbers))
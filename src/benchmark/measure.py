@@ -0,0 +1,136 @@
+"""Time the parts of the days on generated inputs of increasing size."""
+import contextlib
+import dataclasses
+import io
+import itertools
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from multiprocessing.connection import Connection
+
+from src.benchmark.generators import generate
+from src.memory_util import format_size
+from src.run import PARTS, load_day
+
+
+@dataclasses.dataclass
+class Measurement:
+    day: int
+    part: int
+    scale: float
+    input_size: int = 0
+    timings: list[float] = dataclasses.field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def median(self) -> float | None:
+        return statistics.median(self.timings) if self.timings else None
+
+    @property
+    def throughput(self) -> float | None:
+        """Bytes of input per second"""
+        return self.input_size / self.median if self.median else None
+
+
+def growth_exponent(measurements: list[Measurement]) -> float | None:
+    """
+    Least squares fit of log(time) = k * log(size) + c. Time grows like size^k.
+    Only uses the measurements without errors.
+    """
+    points = [(math.log(m.input_size), math.log(m.median)) for m in measurements if m.median and m.input_size]
+    if len(points) < 2 or len({x for x, _ in points}) < 2:
+        return None
+    mean_x, mean_y = statistics.fmean(x for x, _ in points), statistics.fmean(y for _, y in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def _measure_in_child(connection: Connection, day: int, part: int, scale: float, seed: int, repeat: int):
+    # Otherwise only the first run would parse the input
+    os.environ['AOC_PARSE_CACHE'] = '0'
+    workload = generate(day, scale, seed)
+    solver = getattr(load_day(day), f'part{part}')
+    measurement = Measurement(day, part, scale, len(workload.input_data.encode()))
+    connection.send(measurement.input_size)
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                solver(workload.input_data, *workload.args(part))
+            except Exception as e:
+                measurement.error = f'{type(e).__name__}: {e}'
+                break
+            measurement.timings.append(time.perf_counter() - start)
+    connection.send(measurement)
+
+
+def measure(day: int, part: int, scale: float, seed: int = 2022, repeat: int = 3, timeout: float | None = None) -> Measurement:
+    """
+    Generate the input and time `repeat` runs of the part.
+    Runs in a separate process, so a solver that runs away can be stopped after `timeout` seconds.
+    The generation of the input does not count towards the timeout.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure_in_child, args=(sender, day, part, scale, seed, repeat), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        input_size = receiver.recv()
+        if receiver.poll(timeout):
+            return receiver.recv()
+        return Measurement(day, part, scale, input_size, error=f'Timed out after {timeout}s')
+    except EOFError:
+        return Measurement(day, part, scale, error=f'Crashed with exit code {process.exitcode}')
+    finally:
+        process.terminate()
+        process.join()
+
+
+def benchmark(
+        days: list[int],
+        scales: list[float],
+        seed: int = 2022,
+        repeat: int = 3,
+        timeout: float | None = None,
+        parts: tuple[int, ...] = PARTS,
+) -> list[Measurement]:
+    """Measure the parts of the days at increasing scales. Stops scaling up a part once it fails or times out."""
+    measurements = []
+    for day in days:
+        for part in parts:
+            for scale in sorted(scales):
+                measurement = measure(day, part, scale, seed, repeat, timeout)
+                measurements.append(measurement)
+                status = measurement.error or f'{measurement.median:.04f}s'
+                print(f'Day {day} part {part} at scale {scale:g}: {status}', file=sys.stderr)
+                if measurement.error:
+                    break
+    return measurements
+
+
+def format_report(measurements: list[Measurement]) -> str:
+    """
+    Table with a line per measurement.
+    The growth is the exponent k of time ~ size^k, compared to the previous scale and fitted over all scales of the part.
+    """
+    header = f'{"day":>3} {"part":>4} {"scale":>6} {"input":>9} {"median (s)":>11} {"throughput":>12} {"growth":>7}'
+    lines = [header, '-' * len(header)]
+    for (day, part), group in itertools.groupby(measurements, key=lambda m: (m.day, m.part)):
+        group = list(group)
+        previous = None
+        for m in group:
+            if m.error:
+                lines.append(f'{day:>3} {part:>4} {m.scale:>6g} {format_size(m.input_size):>9}  {m.error}')
+                continue
+            growth = f'n^{growth_exponent([previous, m]):.02f}' if previous else '-'
+            lines.append(
+                f'{day:>3} {part:>4} {m.scale:>6g} {format_size(m.input_size):>9} {m.median:>11.04f} '
+                f'{format_size(m.throughput) + "/s" if m.throughput else "-":>12} {growth:>7}'
+            )
+            previous = m
+        if (exponent := growth_exponent(group)) is not None:
+            lines.append(f'{"":>9}overall growth: n^{exponent:.02f}')
+    return '\n'.join(lines)
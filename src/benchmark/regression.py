@@ -0,0 +1,138 @@
+"""
+Compare the benchmark medians against a stored baseline, and fail when a part got slower.
+
+Usage: python -m src.benchmark.regression [days ...] [--baseline FILE] [--tolerance 0.25] [--noise 0.005] [--retries 1] [--write]
+
+With `--write`, the measured days are stored in the baseline instead. Parts that fail or time out while writing the
+baseline are left out of it, and are not checked afterwards.
+"""
+import argparse
+import dataclasses
+import json
+import platform
+import sys
+from pathlib import Path
+
+from src.benchmark.generators import GENERATORS
+from src.benchmark.measure import Measurement, benchmark
+
+BASELINE_FILE = Path(__file__).parent / 'baseline.json'
+
+
+@dataclasses.dataclass
+class Comparison:
+    day: int
+    part: int
+    baseline: float
+    current: float | None = None
+    error: str | None = None
+
+    @property
+    def change(self) -> float | None:
+        """Relative change of the median, 0.1 is 10% slower"""
+        return None if self.current is None else self.current / self.baseline - 1
+
+    def is_regression(self, tolerance: float, noise: float) -> bool:
+        """Slower by more than the tolerance, ignoring differences below `noise` seconds. Failing is a regression too."""
+        if self.error:
+            return True
+        return self.change > tolerance and self.current - self.baseline > noise
+
+
+def load_baseline(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def write_baseline(path: Path, measurements: list[Measurement], scale: float, seed: int, repeat: int):
+    """Replaces the measured days. The other days are kept if the existing baseline was measured with the same settings."""
+    medians = [{'day': m.day, 'part': m.part, 'median': round(m.median, 6)} for m in measurements if m.median is not None]
+    if path.exists():
+        existing = load_baseline(path)
+        if (existing['scale'], existing['seed'], existing['repeat']) == (scale, seed, repeat):
+            days = {m.day for m in measurements}
+            medians += [entry for entry in existing['medians'] if entry['day'] not in days]
+    baseline = {
+        'scale': scale,
+        'seed': seed,
+        'repeat': repeat,
+        # Timings only compare on similar machines
+        'machine': f'{platform.machine()} {platform.processor() or platform.system()} python {platform.python_version()}',
+        'medians': sorted(medians, key=lambda entry: (entry['day'], entry['part'])),
+    }
+    path.write_text(json.dumps(baseline, indent=2) + '\n')
+
+
+def compare(
+        baseline: dict,
+        days: list[int],
+        tolerance: float,
+        noise: float,
+        timeout: float | None = None,
+        retries: int = 1,
+) -> list[Comparison]:
+    """
+    Measure the parts of the days that are in the baseline, with the baseline's settings.
+    A part that looks like a regression is measured again up to `retries` times, keeping the fastest median, so a single
+    noisy measurement doesn't fail the check.
+    """
+    comparisons = []
+    for entry in baseline['medians']:
+        if entry['day'] not in days:
+            continue
+        comparison = Comparison(entry['day'], entry['part'], entry['median'])
+        for _ in range(1 + retries):
+            [measurement] = benchmark([entry['day']], [baseline['scale']], baseline['seed'], baseline['repeat'], timeout, (entry['part'],))
+            if measurement.error:
+                comparison.error = measurement.error
+                break
+            comparison.current = min(comparison.current or measurement.median, measurement.median)
+            if not comparison.is_regression(tolerance, noise):
+                break
+        comparisons.append(comparison)
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison], tolerance: float, noise: float) -> str:
+    header = f'{"day":>3} {"part":>4} {"baseline (s)":>13} {"current (s)":>12} {"change":>8}  status'
+    lines = [header, '-' * len(header)]
+    for c in comparisons:
+        if c.error:
+            lines.append(f'{c.day:>3} {c.part:>4} {c.baseline:>13.04f} {"-":>12} {"-":>8}  REGRESSION: {c.error}')
+            continue
+        status = 'REGRESSION' if c.is_regression(tolerance, noise) else 'faster' if c.change < -tolerance else 'ok'
+        lines.append(f'{c.day:>3} {c.part:>4} {c.baseline:>13.04f} {c.current:>12.04f} {c.change:>+8.01%}  {status}')
+    regressions = sum(c.is_regression(tolerance, noise) for c in comparisons)
+    lines.append('-' * len(header))
+    lines.append(f'{regressions} of {len(comparisons)} parts regressed by more than {tolerance:.0%}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the benchmark medians against a stored baseline.')
+    parser.add_argument('days', nargs='*', type=int, help='days to check, defaults to all days')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='relative slowdown that is still accepted, 0.25 is 25%%')
+    parser.add_argument('--noise', type=float, default=0.005, help='absolute slowdown in seconds that is always accepted')
+    parser.add_argument('--timeout', type=float, default=60, help='seconds before giving up on a part')
+    parser.add_argument('--retries', type=int, default=1, help='times to measure a part again before reporting it as a regression')
+    parser.add_argument('--write', action='store_true', help='measure the days and write them as the new baseline')
+    parser.add_argument('--scale', type=float, default=1, help='input size of the new baseline, with --write')
+    parser.add_argument('--seed', type=int, default=2022, help='seed of the new baseline, with --write')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per part of the new baseline, with --write')
+    args = parser.parse_args()
+    days = args.days or sorted(GENERATORS)
+
+    if args.write:
+        measurements = benchmark(days, [args.scale], args.seed, args.repeat, args.timeout)
+        write_baseline(args.baseline, measurements, args.scale, args.seed, args.repeat)
+        print(f'Wrote the medians of {sum(m.median is not None for m in measurements)} parts to {args.baseline}')
+        return
+
+    comparisons = compare(load_baseline(args.baseline), days, args.tolerance, args.noise, args.timeout, args.retries)
+    print(format_comparisons(comparisons, args.tolerance, args.noise))
+    if any(c.is_regression(args.tolerance, args.noise) for c in comparisons):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
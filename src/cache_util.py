@@ -0,0 +1,178 @@
+import contextlib
+import functools
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+SOURCE_DIR = Path(__file__).parent
+CACHE_DIR = SOURCE_DIR.parent / '.cache'
+
+
+def digest(*parts: str | bytes | bytearray | mmap.mmap) -> str:
+    """Hash of all parts. Every part is length-prefixed, so ('ab', 'c') and ('a', 'bc') differ."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+@functools.cache
+def source_digest() -> str:
+    """
+    Hash of every module under `src`. The days share helpers such as `grid_util` and `search_util`, so a change to any module
+    invalidates the cached values. Computed once per process.
+    """
+    paths = sorted(SOURCE_DIR.rglob('*.py'))
+    return digest(*(part for path in paths for part in (path.relative_to(SOURCE_DIR).as_posix(), path.read_bytes())))
+
+
+class DiskCache:
+    """
+    Pickled values in a directory, one file per key.
+    The modification time of a file is its last use. Once the directory grows past `max_size` bytes, the least recently used
+    files are evicted. Writes go through a temporary file, so concurrent processes never read half a value.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.pickle'
+
+    def get(self, key: str) -> Any:
+        """Raises KeyError when the key is not cached."""
+        path = self._path(key)
+        try:
+            value = pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            raise KeyError(key)
+        except Exception:
+            # Corrupt, or pickled with classes that no longer exist
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+            raise KeyError(key)
+        with contextlib.suppress(OSError):
+            # Only affects which files are evicted first
+            os.utime(path)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Best effort: the value is not cached when the directory can't be written, e.g. on a read-only checkout or a full disk."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_size:
+            return
+        temporary = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as f:
+                temporary = Path(f.name)
+                f.write(data)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            if temporary:
+                with contextlib.suppress(OSError):
+                    temporary.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self):
+        files = []
+        try:
+            paths = list(self.directory.glob('*.pickle'))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                # Not ours to remove, the next eviction tries again
+                continue
+            total_size -= size
+
+    def clear(self):
+        for path in self.directory.glob('*.pickle'):
+            path.unlink(missing_ok=True)
+
+
+class ResultCache:
+    """
+    Memoizes the answers of the parts, keyed on the source of all modules, the input and the other arguments.
+    The `max_entries` most recently used answers are kept in memory. With a `disk` cache, answers survive the process as well.
+    Only answers are cached, exceptions are not.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk: DiskCache | None = None):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def key(self, solver: Callable, input_data: str | bytes | bytearray | mmap.mmap, *args, **kwargs) -> str:
+        return digest(f'{solver.__module__}.{solver.__qualname__}', source_digest(), input_data, repr((args, sorted(kwargs.items()))))
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        """Whether the key is cached, and its answer"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+        if self.disk:
+            try:
+                answer = self.disk.get(key)
+            except KeyError:
+                return False, None
+            self._remember(key, answer)
+            return True, answer
+        return False, None
+
+    def store(self, key: str, answer: Any):
+        self._remember(key, answer)
+        if self.disk:
+            self.disk.set(key, answer)
+
+    def _remember(self, key: str, answer: Any):
+        self._entries[key] = answer
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def solve(self, solver: Callable, input_data: str | bytes | bytearray | mmap.mmap, *args, **kwargs) -> Any:
+        key = self.key(solver, input_data, *args, **kwargs)
+        cached, answer = self.lookup(key)
+        if cached:
+            self.hits += 1
+            return answer
+        self.misses += 1
+        answer = solver(input_data, *args, **kwargs)
+        self.store(key, answer)
+        return answer
+
+    def clear(self):
+        self._entries.clear()
+        if self.disk:
+            self.disk.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+RESULT_CACHE = ResultCache(disk=DiskCache(CACHE_DIR / 'results', max_size=64 * 2 ** 20))
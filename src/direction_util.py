@@ -0,0 +1,36 @@
+"""
+Lookup tables for walking around a grid of (row, column) positions, with rows going down.
+
+The tables are indexed by direction, so a step or a turn is a tuple lookup instead of a `match` on an enum:
+
+    row, column = row + DELTAS[direction][0], column + DELTAS[direction][1]
+    direction = TURNS['R'][direction]
+
+In a flattened grid, `flat_deltas(width)[direction]` is the step as an offset of the flat index.
+"""
+from enum import IntEnum
+
+
+class Direction(IntEnum):
+    """Clockwise, starting at right"""
+    RIGHT = 0
+    DOWN = 1
+    LEFT = 2
+    UP = 3
+
+
+DELTAS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (0, -1), (-1, 0))
+TURN_RIGHT: tuple[Direction, ...] = tuple(Direction((direction + 1) % 4) for direction in Direction)
+TURN_LEFT: tuple[Direction, ...] = tuple(Direction((direction - 1) % 4) for direction in Direction)
+OPPOSITE: tuple[Direction, ...] = tuple(Direction((direction + 2) % 4) for direction in Direction)
+TURNS = {'R': TURN_RIGHT, 'L': TURN_LEFT}
+
+ARROWS = '>v<^'
+LETTERS = 'RDLU'
+BY_ARROW = {arrow: direction for arrow, direction in zip(ARROWS, Direction)}
+BY_LETTER = {letter: direction for letter, direction in zip(LETTERS, Direction)}
+
+
+def flat_deltas(width: int) -> tuple[int, ...]:
+    """The steps as offsets of flat indices, in a grid of rows of `width` cells"""
+    return tuple(row * width + column for row, column in DELTAS)
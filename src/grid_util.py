@@ -0,0 +1,139 @@
+"""
+Grids of small values, such as heights or kinds of tiles, backed by a uint8 NumPy array.
+
+A cell takes a single byte instead of a Python object, and whole-grid operations like counting the neighbours of every
+cell are vectorized with `shift`:
+
+    grid = Grid.parse(input_data, {'.': 0, '#': 1})
+    crowded = grid.count_neighbours(1, ALL_2D) > 3
+
+Loops that visit one cell at a time should index the `flat` view instead of the array.
+"""
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+Position = tuple[int, ...]
+
+ORTHOGONAL_2D: tuple[Position, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+ALL_2D: tuple[Position, ...] = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j)
+ORTHOGONAL_3D: tuple[Position, ...] = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+
+
+def shift(array: np.ndarray, offset: Sequence[int], fill=0) -> np.ndarray:
+    """
+    The array shifted by `offset`: every position holds the value of its neighbour at `offset`.
+    Neighbours outside the array are `fill`.
+    """
+    result = np.full_like(array, fill)
+    if any(abs(o) >= size for o, size in zip(offset, array.shape)):
+        return result
+    source = tuple(slice(max(o, 0), size + min(o, 0)) for o, size in zip(offset, array.shape))
+    target = tuple(slice(max(-o, 0), size - max(o, 0)) for o, size in zip(offset, array.shape))
+    result[target] = array[source]
+    return result
+
+
+class Grid:
+    """
+    A 2D or 3D grid, indexed like its array: grid[row, column] or grid[x, y, z].
+    Positions outside the grid are either checked with `in_bounds`, or avoided with a `padded` border.
+    """
+
+    def __init__(self, cells: np.ndarray):
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+
+    @classmethod
+    def parse(cls, text: str, mapping: dict[str, int] | None = None, fill: str = ' ') -> 'Grid':
+        """
+        A cell per character of the lines of the text. Shorter lines are padded with `fill`.
+        Characters are mapped to values with `mapping`, or kept as their ASCII codes when it is None.
+        """
+        lines = text.split('\n')
+        width = max(len(line) for line in lines)
+        if any(len(line) != width for line in lines):
+            lines = [line.ljust(width, fill) for line in lines]
+        # Every line followed by its newline is a row of width + 1 bytes, so the whole text is parsed at once
+        data = ('\n'.join(lines) + '\n').encode('ascii')
+        cells = np.frombuffer(data, dtype=np.uint8).reshape(len(lines), width + 1)[:, :width]
+        if mapping is None:
+            return cls(cells.copy())
+
+        table = np.zeros(256, dtype=np.uint8)
+        known = np.zeros(256, dtype=bool)
+        for char, value in mapping.items():
+            table[ord(char)] = value
+            known[ord(char)] = True
+        if not (is_known := known[cells]).all():
+            raise ValueError(f'Unexpected character: {chr(cells[~is_known][0])!r}')
+        return cls(table[cells])
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Position], shape: tuple[int, ...], value: int = 1) -> 'Grid':
+        """A grid of zeros, with `value` at the positions."""
+        cells = np.zeros(shape, dtype=np.uint8)
+        positions = np.array(list(positions), dtype=np.intp).reshape(-1, len(shape))
+        cells[tuple(positions.T)] = value
+        return cls(cells)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.cells.shape
+
+    def __getitem__(self, position):
+        return self.cells[position]
+
+    def __setitem__(self, position, value):
+        self.cells[position] = value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Grid) and np.array_equal(self.cells, other.cells)
+
+    def copy(self) -> 'Grid':
+        return Grid(self.cells.copy())
+
+    def in_bounds(self, position: Position) -> bool:
+        return all(0 <= p < size for p, size in zip(position, self.cells.shape))
+
+    def padded(self, width: int = 1, value: int = 0) -> 'Grid':
+        """The grid with a border of `width` cells of `value` on every side."""
+        return Grid(np.pad(self.cells, width, constant_values=value))
+
+    def shift(self, offset: Sequence[int], fill: int = 0) -> np.ndarray:
+        return shift(self.cells, offset, fill)
+
+    def neighbours(self, position: Position, offsets: Iterable[Position] = ORTHOGONAL_2D) -> Iterator[Position]:
+        """The neighbours of the position that are inside the grid."""
+        for offset in offsets:
+            neighbour = tuple(p + o for p, o in zip(position, offset))
+            if self.in_bounds(neighbour):
+                yield neighbour
+
+    def count_neighbours(self, value: int, offsets: Iterable[Position] = ORTHOGONAL_2D) -> np.ndarray:
+        """For every cell, the number of its neighbours that are `value`."""
+        matches = self.cells == value
+        counts = np.zeros(self.cells.shape, dtype=np.uint8)
+        for offset in offsets:
+            counts += shift(matches, offset)
+        return counts
+
+    def positions(self, value: int) -> list[Position]:
+        return [tuple(position) for position in np.argwhere(self.cells == value).tolist()]
+
+    def flat(self) -> memoryview:
+        """
+        The cells as a flat view, a row after the other. Writes go through to the grid.
+        Indexing it is several times faster than indexing the array, which matters in loops that visit one cell at a time.
+        """
+        return memoryview(self.cells).cast('B')
+
+    def flat_offsets(self, offsets: Iterable[Position]) -> list[int]:
+        """The offsets as steps in the flattened cells. Only valid for positions whose neighbours are all in bounds."""
+        strides = [stride // self.cells.itemsize for stride in self.cells.strides]
+        return [sum(o * stride for o, stride in zip(offset, strides)) for offset in offsets]
+
+    def to_text(self, chars: str) -> str:
+        """The rows of a 2D grid, with `chars[value]` for every cell."""
+        table = np.frombuffer(chars.encode('ascii'), dtype=np.uint8)
+        rows = table[self.cells]
+        return '\n'.join(row.tobytes().decode('ascii') for row in rows)
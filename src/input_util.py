@@ -1,13 +1,113 @@
+import contextlib
+import functools
+import mmap
+import os
 import sys
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
 
+from src.cache_util import CACHE_DIR, DiskCache, digest, source_digest
 
-def get_input() -> str:
-    """Parse the day from the script name, open the corresponding input file."""
+INPUT_DIR = Path(__file__).parent.parent / 'input'
+PARSE_CACHE = DiskCache(CACHE_DIR / 'parse', max_size=256 * 2 ** 20)
+
+# The whole input as a string, or as a buffer such as the memory-mapped input file
+InputData = str | bytes | bytearray | mmap.mmap
+# Lines of the input with or without their newlines, e.g. from `iter_lines` or an open file
+Lines = Iterable[str | bytes]
+# Characters of the input that are split into lines or records at a time
+SPLIT_CHUNK_SIZE = 2 ** 20
+
+
+def day_from_script_name() -> int:
+    """Parse the day from the script name."""
     script_file_name = Path(sys.argv[0]).name
     try:
-        day = int(''.join(c for c in script_file_name if c.isdigit()))
+        return int(''.join(c for c in script_file_name if c.isdigit()))
     except ValueError:
         raise ValueError(f'Unexpected script name: {script_file_name}')
-    input_file = Path(__file__).parent.parent / 'input' / f'{day}.txt'
+
+
+def get_input(day: int | None = None) -> str:
+    """Open the input file of the given day. Defaults to the day parsed from the script name."""
+    if day is None:
+        day = day_from_script_name()
+    input_file = INPUT_DIR / f'{day}.txt'
     return input_file.read_text().strip('\n')
+
+
+@contextlib.contextmanager
+def map_input(day: int | None = None) -> Iterator[mmap.mmap | bytes]:
+    """
+    Memory-map the input file of the given day, read-only. Defaults to the day parsed from the script name.
+    The OS pages the file in on demand, so combined with `iter_lines` or `iter_records` the input is never copied as a whole.
+    """
+    if day is None:
+        day = day_from_script_name()
+    with open(INPUT_DIR / f'{day}.txt', 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def iter_lines(input_data: InputData, encoding: str | None = 'ascii') -> Iterator[str | bytes]:
+    """
+    Lazily yield the lines of the input, without the newlines. A trailing newline doesn't yield an extra empty line.
+    Lines of a buffer are decoded with `encoding`, or yielded as bytes when it is None. Only a line at a time is copied.
+    """
+    yield from _iter_split(input_data, '\n', encoding)
+
+
+def iter_records(input_data: InputData, encoding: str | None = 'ascii') -> Iterator[str | bytes]:
+    """Lazily yield the blocks of lines that are separated by blank lines, without the surrounding newlines."""
+    for record in _iter_split(input_data, '\n\n', encoding):
+        if record := record.strip('\n' if isinstance(record, str) else b'\n'):
+            yield record
+
+
+def _iter_split(input_data: InputData, separator: str, encoding: str | None) -> Iterator[str | bytes]:
+    """Splits a chunk of about SPLIT_CHUNK_SIZE at a time, which is much faster than finding every separator in Python."""
+    is_text = isinstance(input_data, str)
+    if not is_text:
+        separator = separator.encode()
+    start, end = 0, len(input_data)
+    while start < end:
+        stop = input_data.find(separator, start + SPLIT_CHUNK_SIZE) if start + SPLIT_CHUNK_SIZE < end else -1
+        if stop == -1:
+            stop = end
+            chunk = input_data[start:stop]
+            if chunk.endswith(separator):
+                chunk = chunk[:-len(separator)]
+        else:
+            chunk = input_data[start:stop]
+        yield from chunk.split(separator) if is_text or encoding is None else chunk.decode(encoding).split(separator.decode())
+        start = stop + len(separator)
+
+
+F = TypeVar('F', bound=Callable)
+
+
+def parse_cache(parser: F) -> F:
+    """
+    Decorator that caches the parsed input on disk.
+    Keyed on the input, the other arguments and the source of all modules, so changing any of them invalidates the cache.
+    The parsed value has to be picklable. Set AOC_PARSE_CACHE=0 to disable the cache.
+    """
+    identity = f'{parser.__module__}.{parser.__qualname__}'
+
+    @functools.wraps(parser)
+    def wrapper(input_data: str, *args, **kwargs):
+        if os.environ.get('AOC_PARSE_CACHE') == '0':
+            return parser(input_data, *args, **kwargs)
+        key = digest(identity, source_digest(), input_data, repr((args, sorted(kwargs.items()))))
+        try:
+            return PARSE_CACHE.get(key)
+        except KeyError:
+            value = parser(input_data, *args, **kwargs)
+            PARSE_CACHE.set(key, value)
+            return value
+
+    return wrapper
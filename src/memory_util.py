@@ -0,0 +1,123 @@
+"""
+Memory usage of a block of code: the peak RSS of the process, and the allocation sites at the peak of traced memory.
+
+    with MemoryTracker() as tracker:
+        part1(input_data)
+    print(tracker.peak_rss, tracker.top_allocations)
+"""
+import re
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Not on Windows
+    resource = None
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def reset_peak_rss():
+    """Start the peak RSS over from the current RSS. Only possible on Linux, elsewhere the peak is that of the whole process."""
+    try:
+        Path('/proc/self/clear_refs').write_text('5')
+    except OSError:
+        pass
+
+
+def peak_rss() -> int | None:
+    """Highest resident set size in bytes since the last reset, or None when unknown."""
+    try:
+        status = Path('/proc/self/status').read_text()
+    except OSError:
+        if resource is None:
+            return None
+        # Kilobytes, except on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    match = re.search(r'VmHWM:\s+(\d+) kB', status)
+    return int(match.group(1)) * 1024 if match else None
+
+
+def format_size(size: float) -> str:
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1000:
+            return f'{size:.01f}{unit}'
+        size /= 1000
+    return f'{size:.01f}GB'
+
+
+class MemoryTracker:
+    """
+    Traces the allocations while active. A background thread samples the traced memory every `interval` seconds, and
+    snapshots the allocations whenever they grew by more than `growth` since the last snapshot. That way the sites of
+    intermediate structures that are freed before the end are reported too, without snapshotting all the time.
+
+    peak_rss: highest resident set size in bytes, None when unknown
+    peak_traced: highest traced memory in bytes
+    top_allocations: the `top` lines that had the most memory allocated at the last snapshot, as (file:line, bytes)
+    """
+
+    def __init__(self, top: int = 5, interval: float = 0.01, growth: float = 0.1):
+        self.top = top
+        self.interval = interval
+        self.growth = growth
+        self.peak_rss: int | None = None
+        self.peak_traced = 0
+        self.top_allocations: list[tuple[str, int]] = []
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_size = 0
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_tracing = False
+
+    def __enter__(self) -> 'MemoryTracker':
+        reset_peak_rss()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self._stopped.set()
+        self._thread.join()
+        self._check()
+        self.peak_traced = max(self.peak_traced, tracemalloc.get_traced_memory()[1])
+        self.peak_rss = peak_rss()
+        if self._snapshot:
+            self.top_allocations = self._top_allocations(self._snapshot)
+        self._snapshot = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            self._check()
+
+    def _check(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_traced = max(self.peak_traced, peak)
+        if current > self._snapshot_size * (1 + self.growth):
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+
+    def _top_allocations(self, snapshot: tracemalloc.Snapshot) -> list[tuple[str, int]]:
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ])
+        top_allocations = []
+        for statistic in snapshot.statistics('lineno')[:self.top]:
+            frame = statistic.traceback[0]
+            path = Path(frame.filename)
+            if path.is_relative_to(ROOT_DIR):
+                path = path.relative_to(ROOT_DIR)
+            top_allocations.append((f'{path}:{frame.lineno}', statistic.size))
+        return top_allocations
@@ -0,0 +1,211 @@
+"""
+Run the solutions of all days in parallel and print a timing table.
+
+Usage: python -m src.run [days ...] [--workers N] [--progress] [--no-cache] [--memory] [--profile DIR [--profile-memory]]
+
+Answers are cached per source and input, see `src.cache_util.ResultCache`.
+"""
+import argparse
+import contextlib
+import dataclasses
+import importlib
+import io
+import os
+import pkgutil
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import src.advent_of_code
+from src.cache_util import RESULT_CACHE
+from src.input_util import get_input
+from src.memory_util import MemoryTracker, format_size
+from src.timer_util import Profiler
+
+PARTS = (1, 2)
+
+
+@dataclasses.dataclass
+class RunOptions:
+    """
+    show_progress: show the progress bars of the solutions
+    profile_dir: write the spans of every part to this directory, as JSON and as collapsed stacks. Bypasses the cache
+    trace_memory: also record the peak memory of the spans, which slows down the solutions
+    use_cache: reuse the answer of a previous run when neither the module nor the input changed. Profiling and tracking
+        memory bypass the cache, so their numbers are those of the solution and not of a cache lookup
+    track_memory: record the peak RSS and the top allocation sites of every part, which slows down the solutions
+    """
+    show_progress: bool = False
+    profile_dir: Path | None = None
+    trace_memory: bool = False
+    use_cache: bool = True
+    track_memory: bool = False
+
+
+@dataclasses.dataclass
+class PartResult:
+    day: int
+    part: int
+    answer: Any = None
+    error: str | None = None
+    wall_time: float = 0
+    cpu_time: float = 0
+    cached: bool | None = None  # None when the cache is not used
+    peak_rss: int | None = None
+    peak_traced: int | None = None
+    top_allocations: list[tuple[str, int]] = dataclasses.field(default_factory=list)
+
+
+def find_days() -> list[int]:
+    """All days for which there is a `day_N` module."""
+    days = []
+    for module_info in pkgutil.iter_modules(src.advent_of_code.__path__):
+        if match := re.fullmatch(r'day_(\d+)', module_info.name):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(f'{src.advent_of_code.__name__}.day_{day}')
+
+
+def solve_part(
+        day: int,
+        part: int,
+        options: RunOptions = RunOptions(),
+        input_data: str | None = None,
+        kwargs: dict[str, Any] | None = None,
+) -> PartResult:
+    """
+    Solve a single part, measuring wall and CPU time. Exceptions end up in the result.
+    Defaults to the real input. The `kwargs` are passed on to the part as keyword arguments, e.g. `y` of day 15.
+    """
+    kwargs = kwargs or {}
+    result = PartResult(day, part)
+    solver = getattr(load_day(day), f'part{part}')
+    if input_data is None:
+        input_data = get_input(day)
+
+    # tqdm writes to stderr, which gets messy when several days run at once
+    stderr = contextlib.nullcontext() if options.show_progress else contextlib.redirect_stderr(io.StringIO())
+    profiler = Profiler(f'day_{day}_part_{part}', options.trace_memory)
+    tracker = MemoryTracker()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with (
+        stderr,
+        profiler if options.profile_dir else contextlib.nullcontext(),
+        tracker if options.track_memory else contextlib.nullcontext(),
+    ):
+        try:
+            if options.use_cache and not options.profile_dir and not options.track_memory:
+                hits = RESULT_CACHE.hits
+                result.answer = RESULT_CACHE.solve(solver, input_data, **kwargs)
+                result.cached = RESULT_CACHE.hits > hits
+            else:
+                result.answer = solver(input_data, **kwargs)
+        except Exception as e:
+            result.error = f'{type(e).__name__}: {e}'
+    result.wall_time = time.perf_counter() - wall_start
+    result.cpu_time = time.process_time() - cpu_start
+    if options.track_memory:
+        result.peak_rss, result.peak_traced, result.top_allocations = tracker.peak_rss, tracker.peak_traced, tracker.top_allocations
+
+    if options.profile_dir:
+        options.profile_dir.mkdir(parents=True, exist_ok=True)
+        (options.profile_dir / f'{profiler.root.name}.json').write_text(profiler.to_json())
+        (options.profile_dir / f'{profiler.root.name}.collapsed').write_text(profiler.to_collapsed())
+    return result
+
+
+def run(days: list[int], workers: int | None = None, options: RunOptions = RunOptions()) -> list[PartResult]:
+    """Solve every part of the given days on a process pool. Results are ordered by day and part."""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(solve_part, day, part, options) for day in days for part in PARTS]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f'Finished day {result.day} part {result.part} in {result.wall_time:.02f}s', file=sys.stderr)
+    return sorted(results, key=lambda r: (r.day, r.part))
+
+
+def format_answer(result: PartResult) -> str:
+    if result.error:
+        return result.error
+    if '\n' in str(result.answer):
+        return '(multiline, see below)'
+    return str(result.answer)
+
+
+def format_cache(result: PartResult) -> str:
+    if result.cached is None:
+        return '-'
+    return 'hit' if result.cached else 'miss'
+
+
+def format_table(results: list[PartResult], total_wall_time: float) -> str:
+    header = f'{"day":>3} {"part":>4} {"wall (s)":>9} {"cpu (s)":>9} {"cache":>5}  answer'
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f'{result.day:>3} {result.part:>4} {result.wall_time:>9.02f} {result.cpu_time:>9.02f} {format_cache(result):>5}  '
+            f'{format_answer(result)}'
+        )
+    lines.append('-' * len(header))
+    lines.append(f'{"total":>8} {total_wall_time:>9.02f} {sum(r.cpu_time for r in results):>9.02f}')
+    if any(r.cached is not None for r in results):
+        hits = sum(r.cached is True for r in results)
+        misses = sum(r.cached is False for r in results)
+        lines.append(f'cache: {hits} hits, {misses} misses')
+
+    if any(r.peak_traced is not None for r in results):
+        lines.append('')
+        lines.append(format_memory(results))
+
+    for result in results:
+        if not result.error and '\n' in str(result.answer):
+            lines.append('')
+            lines.append(f'Day {result.day} part {result.part}:')
+            lines.append(str(result.answer))
+    return '\n'.join(lines)
+
+
+def format_memory(results: list[PartResult]) -> str:
+    """The peak memory of every part, with the lines that had allocated the most memory around the peak."""
+    lines = ['Memory:']
+    for result in results:
+        if result.peak_traced is None:
+            continue
+        rss = format_size(result.peak_rss) if result.peak_rss is not None else 'unknown'
+        lines.append(f'Day {result.day} part {result.part}: peak RSS {rss}, peak traced {format_size(result.peak_traced)}')
+        for site, size in result.top_allocations:
+            lines.append(f'{format_size(size):>12}  {site}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the solutions of all days in parallel.')
+    parser.add_argument('days', nargs='*', type=int, help='days to run, defaults to all days')
+    parser.add_argument('--workers', type=int, default=None, help='size of the process pool, defaults to the number of CPUs')
+    parser.add_argument('--progress', action='store_true', help='show the progress bars of the solutions')
+    parser.add_argument('--no-cache', action='store_true', help='solve every part again, even when its answer is cached')
+    parser.add_argument('--memory', action='store_true', help='record the peak RSS and top allocation sites per part, bypasses the cache and slows down the solutions')
+    parser.add_argument('--profile', type=Path, default=None, metavar='DIR', help='write the timed spans of every part to this directory, bypasses the cache')
+    parser.add_argument('--profile-memory', action='store_true', help='also record the peak memory per span, slows down the solutions')
+    args = parser.parse_args()
+
+    days = args.days or find_days()
+    options = RunOptions(args.progress, args.profile, args.profile_memory, not args.no_cache, args.memory)
+    start = time.perf_counter()
+    results = run(days, args.workers, options)
+    print(format_table(results, time.perf_counter() - start))
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Graph searches over states that are ints, such as flat grid indices or tuples packed with `Packing`.
+
+The searches are generators that yield every state they reach once, together with its distance or cost, in the order
+they are settled. Stop iterating once the goal is found:
+
+    distance = next(d for state, d in bfs([start], neighbours) if state == goal)
+
+All searches start from any number of states at once, and keep track of the visited states in a set, or in a `Bitset`
+when the states are small enough.
+"""
+import heapq
+import math
+from typing import Callable, Iterable, Iterator, Protocol
+
+State = int
+
+
+class Visited(Protocol):
+    def __contains__(self, state: State) -> bool: ...
+
+    def add(self, state: State): ...
+
+
+class Bitset:
+    """A set of the ints 0 to size - 1, a bit each. Much smaller than a set, for large state spaces."""
+    __slots__ = ('bits',)
+
+    def __init__(self, size: int):
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __contains__(self, state: State) -> bool:
+        return self.bits[state >> 3] >> (state & 7) & 1 == 1
+
+    def add(self, state: State):
+        self.bits[state >> 3] |= 1 << (state & 7)
+
+    def __len__(self) -> int:
+        return sum(byte.bit_count() for byte in self.bits)
+
+    def __iter__(self) -> Iterator[State]:
+        for i, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield i * 8 + low.bit_length() - 1
+                byte ^= low
+
+
+class Packing:
+    """
+    Packs tuples of non-negative ints into a single int, and back. Every value has to be smaller than its size.
+    E.g. Packing(lcm, height, width) for a (time, row, column) state. `size` is the number of distinct states.
+    """
+
+    def __init__(self, *sizes: int):
+        self.sizes = sizes
+        self.size = math.prod(sizes)
+
+    def pack(self, *values: int) -> State:
+        state = 0
+        for value, size in zip(values, self.sizes):
+            state = state * size + value
+        return state
+
+    def unpack(self, state: State) -> tuple[int, ...]:
+        values = []
+        for size in reversed(self.sizes):
+            state, value = divmod(state, size)
+            values.append(value)
+        return tuple(reversed(values))
+
+
+def bfs(
+        starts: Iterable[State],
+        neighbours: Callable[[State], Iterable[State]],
+        visited: Visited | None = None,
+) -> Iterator[tuple[State, int]]:
+    """Breadth first search for unweighted graphs. Yields the states with the number of steps from the nearest start."""
+    visited = set() if visited is None else visited
+    frontier = []
+    for state in starts:
+        if state not in visited:
+            visited.add(state)
+            frontier.append(state)
+
+    distance = 0
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            yield state, distance
+            for neighbour in neighbours(state):
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+        distance += 1
+
+
+def dijkstra(
+        starts: Iterable[State],
+        neighbours: Callable[[State], Iterable[tuple[State, int]]],
+        heuristic: Callable[[State], int] | None = None,
+        visited: Visited | None = None,
+) -> Iterator[tuple[State, int]]:
+    """
+    Search for graphs with non-negative costs. `neighbours` yields the neighbouring states with the cost to step to them.
+    Yields the states with the lowest cost from any start, in order of cost.
+    With a heuristic, this is A*: states are settled in order of cost plus the estimated remaining cost. The heuristic
+    must never overestimate, and must not drop by more than the cost of a step, for the costs to be the lowest.
+    """
+    visited = set() if visited is None else visited
+    best_costs: dict[State, int] = {}
+    heap = []
+    for state in starts:
+        best_costs[state] = 0
+        heap.append((heuristic(state) if heuristic else 0, 0, state))
+    heapq.heapify(heap)
+
+    while heap:
+        _, cost, state = heapq.heappop(heap)
+        if state in visited:
+            continue
+        visited.add(state)
+        yield state, cost
+        for neighbour, step_cost in neighbours(state):
+            new_cost = cost + step_cost
+            if neighbour not in visited and new_cost < best_costs.get(neighbour, new_cost + 1):
+                best_costs[neighbour] = new_cost
+                heapq.heappush(heap, (new_cost + (heuristic(neighbour) if heuristic else 0), new_cost, neighbour))
+
+
+def a_star(
+        starts: Iterable[State],
+        neighbours: Callable[[State], Iterable[tuple[State, int]]],
+        heuristic: Callable[[State], int],
+        visited: Visited | None = None,
+) -> Iterator[tuple[State, int]]:
+    """Dijkstra guided by the heuristic, see `dijkstra`."""
+    return dijkstra(starts, neighbours, heuristic, visited)
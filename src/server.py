@@ -0,0 +1,182 @@
+"""
+Local HTTP service that solves parts for inputs that are posted to it.
+
+Usage: python -m src.server [--host HOST] [--port PORT] [--workers N] [--queue-size N] [--timeout SECONDS]
+
+The day modules are imported once per worker process, so a solve doesn't pay for starting the interpreter.
+
+    POST /solve/<day>/<part>[?name=value...]   input as the body, the query parameters are passed on to the part
+    GET  /days                                 the days that can be solved
+    GET  /stats                                the number of queued and solved requests
+
+A solve responds with the fields of `src.run.PartResult` as JSON. Query parameters that the part doesn't accept are a 400,
+an input that the part fails on is a 422, and when the queue is full, the response is a 503.
+The parts only parse their input, none of them evaluate it, so the server can be exposed to clients that aren't trusted.
+"""
+import argparse
+import dataclasses
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from src.run import PARTS, RunOptions, find_days, load_day, solve_part
+
+SOLVE_PATH = re.compile(r'/solve/(\d+)/(\d+)')
+
+
+def init_server_worker():
+    for day in find_days():
+        load_day(day)
+
+
+def parse_query(query: str) -> dict[str, Any]:
+    """Query parameters as keyword arguments. Values are parsed as JSON when possible, so `?y=10` passes an int."""
+    kwargs = {}
+    for name, value in parse_qsl(query):
+        try:
+            kwargs[name] = json.loads(value)
+        except ValueError:
+            kwargs[name] = value
+    return kwargs
+
+
+def check_arguments(day: int, part: int, kwargs: dict[str, Any]):
+    """Raises TypeError when the part can't be called with these keyword arguments."""
+    solver = getattr(load_day(day), f'part{part}')
+    inspect.signature(solver).bind('', **kwargs)
+
+
+class SolveServer(ThreadingHTTPServer):
+    """
+    Every request is handled in its own thread, which hands the solve to the process pool and waits for it.
+    At most `queue_size` solves are queued or running at once, others are refused.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], workers: int | None = None, queue_size: int = 256, timeout: float | None = None):
+        super().__init__(address, SolveHandler)
+        self.days = find_days()
+        self.timeout = timeout
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=init_server_worker)
+        self.queue_size = queue_size
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.solved = 0
+        self.refused = 0
+
+    def solve(self, day: int, part: int, input_data: str, kwargs: dict[str, Any]) -> dict[str, Any] | None:
+        """The result as a dict, or None when the queue is full. Raises TimeoutError when the solve takes too long."""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.refused += 1
+            return None
+        with self.lock:
+            self.pending += 1
+        try:
+            future = self.executor.submit(solve_part, day, part, RunOptions(), input_data, kwargs)
+        except BaseException:
+            self._finished(None)
+            raise
+        # A solve that timed out keeps its worker busy, so it only frees its slot once it is done
+        future.add_done_callback(self._finished)
+        return dataclasses.asdict(future.result(self.timeout))
+
+    def _finished(self, future: Future | None):
+        with self.lock:
+            self.pending -= 1
+            if future is not None and not future.cancelled():
+                self.solved += 1
+        self.slots.release()
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {'pending': self.pending, 'queue_size': self.queue_size, 'solved': self.solved, 'refused': self.refused}
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+
+class SolveHandler(BaseHTTPRequestHandler):
+    server: SolveServer
+
+    def do_GET(self):
+        match urlsplit(self.path).path:
+            case '/days':
+                self.send_json(HTTPStatus.OK, {'days': self.server.days, 'parts': list(PARTS)})
+            case '/stats':
+                self.send_json(HTTPStatus.OK, self.server.stats())
+            case _:
+                self.send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path: {self.path}'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if not (match := SOLVE_PATH.fullmatch(url.path)):
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path: {self.path}'})
+            return
+        day, part = int(match.group(1)), int(match.group(2))
+        if day not in self.server.days or part not in PARTS:
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'No solution for day {day} part {part}'})
+            return
+        try:
+            input_data = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode().strip('\n')
+        except (ValueError, UnicodeDecodeError) as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': f'Invalid input: {e}'})
+            return
+
+        kwargs = parse_query(url.query)
+        try:
+            check_arguments(day, part, kwargs)
+        except TypeError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': f'Invalid arguments: {e}'})
+            return
+
+        try:
+            result = self.server.solve(day, part, input_data, kwargs)
+        except TimeoutError:
+            self.send_json(HTTPStatus.GATEWAY_TIMEOUT, {'error': f'Timed out after {self.server.timeout}s'})
+            return
+        if result is None:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Too many queued solves'})
+        else:
+            # The parts solve the real inputs, so a part that fails does so on the posted input
+            self.send_json(HTTPStatus.UNPROCESSABLE_ENTITY if result['error'] else HTTPStatus.OK, result)
+
+    def send_json(self, status: HTTPStatus, body: dict[str, Any]):
+        # Answers are ints or strings, but the answer of an unfinished part might be anything
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the solutions over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8022)
+    parser.add_argument('--workers', type=int, default=None, help='size of the process pool, defaults to the number of CPUs')
+    parser.add_argument('--queue-size', type=int, default=256, help='solves that can be queued or running before refusing requests')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds to wait for a solve')
+    args = parser.parse_args()
+
+    with SolveServer((args.host, args.port), args.workers, args.queue_size, args.timeout) as server:
+        print(f'Serving on http://{args.host}:{server.server_port}', file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,171 @@
+"""
+Timing of named phases of a solution.
+
+Wrap phases in `span('parse')`, or decorate functions with `@profiled()`. Spans nest, and are aggregated per path:
+calling the same span twice from the same parent adds up the time and the calls.
+Spans do nothing unless a `Profiler` is active, so they are cheap to leave in the code:
+
+    with Profiler(trace_memory=True) as profiler:
+        part1(input_data)
+    print(profiler.to_json())
+"""
+import contextlib
+import dataclasses
+import functools
+import json
 import timeit
+import tracemalloc
+from typing import Any, Callable, Iterator, TypeVar
+
+
+@dataclasses.dataclass
+class SpanStats:
+    """
+    wall_time: total seconds spent in the span, including its children
+    peak_memory: highest traced memory in bytes above the memory at the start of the span. Only when tracing memory
+    """
+    name: str
+    calls: int = 0
+    wall_time: float = 0
+    peak_memory: int = 0
+    children: dict[str, 'SpanStats'] = dataclasses.field(default_factory=dict)
+
+    @property
+    def self_time(self) -> float:
+        return max(0., self.wall_time - sum(child.wall_time for child in self.children.values()))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_time': self.wall_time,
+            'self_time': self.self_time,
+            'peak_memory': self.peak_memory,
+            'children': [child.to_dict() for child in self.children.values()],
+        }
+
+
+@dataclasses.dataclass
+class _Frame:
+    stats: SpanStats
+    start_time: float
+    start_memory: int = 0
+    peak_memory: int = 0  # highest absolute traced memory seen so far, tracemalloc's own peak gets reset by the children
+
+
+class Profiler:
+
+    def __init__(self, name: str = 'root', trace_memory: bool = False):
+        self.root = SpanStats(name)
+        self.trace_memory = trace_memory
+        self._stack: list[_Frame] = []
+        self._previous_profiler: Profiler | None = None
+        self._started_tracing = False
+
+    def __enter__(self) -> 'Profiler':
+        global _active_profiler
+        self._previous_profiler, _active_profiler = _active_profiler, self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._push(self.root)
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        global _active_profiler
+        self._pop()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        _active_profiler = self._previous_profiler
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[SpanStats]:
+        stats = self._stack[-1].stats.children.setdefault(name, SpanStats(name))
+        self._push(stats)
+        try:
+            yield stats
+        finally:
+            self._pop()
+
+    def _push(self, stats: SpanStats):
+        frame = _Frame(stats, timeit.default_timer())
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, peak)
+            tracemalloc.reset_peak()
+            frame.start_memory = frame.peak_memory = current
+        self._stack.append(frame)
+
+    def _pop(self):
+        frame = self._stack.pop()
+        frame.stats.calls += 1
+        frame.stats.wall_time += timeit.default_timer() - frame.start_time
+        if self.trace_memory:
+            peak = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+            frame.stats.peak_memory = max(frame.stats.peak_memory, peak - frame.start_memory)
+            if self._stack:
+                self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, peak)
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.root.to_dict(), indent=indent)
+
+    def to_collapsed(self) -> str:
+        """Collapsed stacks with the self time in microseconds, as used by flamegraph.pl and speedscope."""
+        lines = []
+        to_visit = [((self.root.name,), self.root)]
+        while to_visit:
+            path, stats = to_visit.pop()
+            if (self_time := round(stats.self_time * 1e6)) > 0:
+                lines.append(f'{";".join(path)} {self_time}')
+            to_visit += [(path + (child.name,), child) for child in reversed(stats.children.values())]
+        return '\n'.join(lines)
+
+
+_active_profiler: Profiler | None = None
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """Time a phase of the code, as a child of the current span. Does nothing unless a Profiler is active."""
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.span(name)
+
+
+F = TypeVar('F', bound=Callable)
+
+
+def profiled(name: str | None = None) -> Callable[[F], F]:
+    """Decorator that wraps every call of the function in a span. Defaults to the name of the function."""
+
+    def decorator(f: F) -> F:
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            with span(name or f.__name__):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 class ContextTimer:
+    """Prints the duration of the block when it takes longer than `threshold` seconds. Also recorded as a span."""
 
-    def __enter__(self, threshold: float = 3):
+    def __init__(self, threshold: float = 3, name: str = 'timer'):
         self.threshold = threshold
+        self.name = name
+        self._span = None
+
+    def __enter__(self) -> 'ContextTimer':
+        self._span = span(self.name)
+        self._span.__enter__()
         self.start = timeit.default_timer()
+        return self
 
     def __exit__(self, *args, **kwargs):
         duration = timeit.default_timer() - self.start
+        self._span.__exit__(*args, **kwargs)
         if duration > self.threshold:
             print(f'duration: {duration:.02f}s')